@@ -0,0 +1,6 @@
+"""Application metadata shared by the GUI and the headless CLI (no Qt import)."""
+
+APP_NAME = "DiscordEmotify"
+__version__ = "1.2.0"
+REPO_URL = "https://github.com/Otm02/DiscordEmotifyV2"
+USER_AGENT = f"{APP_NAME}/{__version__} (+{REPO_URL})"
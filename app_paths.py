@@ -0,0 +1,50 @@
+"""Per-user cache/data directories, resolved without importing Qt.
+
+Mirrors the locations ``QStandardPaths`` would pick so headless tools and the
+GUI share the same files.
+"""
+
+import hashlib
+import os
+import sys
+
+APP_DIR_NAME = "DiscordEmotify"
+
+
+def user_cache_dir() -> str:
+    """Directory for disposable caches (safe to delete at any time)."""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            "~\\AppData\\Local"
+        )
+        return os.path.join(base, APP_DIR_NAME, "Cache")
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~/Library/Caches"), APP_DIR_NAME)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def user_data_dir() -> str:
+    """Directory for state that should survive cache cleanups."""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+        return os.path.join(base, APP_DIR_NAME)
+    if sys.platform == "darwin":
+        return os.path.join(
+            os.path.expanduser("~/Library/Application Support"), APP_DIR_NAME
+        )
+    base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def account_scope(token: str) -> str:
+    """Short stable id of the account behind ``token`` (never the token
+    itself), for files and entries that hold per-account state."""
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()[:16] if token else ""
+
+
+def message_index_path(token: str) -> str:
+    """Per-account message index: reaction ``me`` flags belong to one user."""
+    return os.path.join(
+        user_cache_dir(), "messages", f"{account_scope(token) or 'default'}.sqlite3"
+    )
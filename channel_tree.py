@@ -0,0 +1,199 @@
+"""Model/view pieces of the friends/channels list.
+
+``ChannelTreeModel`` holds the rows (a two-level tree: categories and their
+channels, or a flat list of friends/DMs) without creating a widget per row.
+``ChannelFilterProxy`` applies the search box, and ``IconRequestDelegate``
+asks for a row's icon only when the view actually paints that row, so a list
+of thousands of DMs renders at once and downloads only the avatars that come
+into view.
+
+Rows are given as dicts ``{"key", "text", "data", "icon"?, "children"?}``:
+``key`` is a stable identity used to diff refreshed lists, ``data`` is what a
+click acts on (channel id, ``"dm:<user>"``, ...), and ``icon`` is the CDN path
+of an avatar, e.g. ``avatars/<user>/<hash>`` (None for the default icon; no
+``icon`` key means no icon at all). The view picks the image size and format.
+"""
+
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt5.QtWidgets import QStyledItemDelegate
+
+KEY_ROLE = Qt.UserRole + 1  # stable row identity
+ICON_ROLE = Qt.UserRole + 2  # avatar CDN path ("" when the row has no icon)
+
+_NO_ICON = ""
+
+
+class _Node:
+    __slots__ = ("key", "text", "data", "icon", "children", "parent", "row", "gen")
+
+    def __init__(self, key=None):
+        self.key = key
+        self.text = ""
+        self.data = None
+        self.icon = _NO_ICON
+        self.children = []
+        self.parent = None
+        self.row = 0
+        self.gen = 0
+
+
+class ChannelTreeModel(QAbstractItemModel):
+    """Rows of the channels tree; refreshed in place with ``set_rows``.
+
+    ``icon_source(path)`` returns a ready ``QIcon`` for an avatar path or None
+    if it is not loaded yet (rows then show ``default_icon``).
+    """
+
+    def __init__(self, icon_source, default_icon=None, parent=None):
+        super().__init__(parent)
+        self._root = _Node()
+        self._icon_source = icon_source
+        self.default_icon = default_icon
+        self._by_icon = {}  # path -> [node, ...]
+        self._gen = 0
+
+    # ---- structure ----
+    def _node(self, index: QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if column != 0 or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, 0, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        p = index.internalPointer().parent
+        if p is None or p is self._root:
+            return QModelIndex()
+        return self.createIndex(p.row, 0, p)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.text
+        if role == Qt.UserRole:
+            return node.data
+        if role == KEY_ROLE:
+            return node.key
+        if role == ICON_ROLE:
+            return node.icon or ""
+        if role == Qt.DecorationRole and node.icon is not _NO_ICON:
+            if node.icon:
+                icon = self._icon_source(node.icon)
+                if icon is not None:
+                    return icon
+            return self.default_icon
+        return None
+
+    # ---- updates ----
+    def clear(self):
+        self.beginResetModel()
+        self._root = _Node()
+        self._by_icon = {}
+        self.endResetModel()
+
+    def set_rows(self, rows: list):
+        """Replace the rows, keeping nodes (and so selection/expansion) by key."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_nodes = [i.internalPointer() for i in persistent]
+        old = {}
+        stack = list(self._root.children)
+        while stack:
+            node = stack.pop()
+            old[node.key] = node
+            stack.extend(node.children)
+        self._gen += 1
+        self._by_icon = {}
+        self._fill(self._root, rows, old)
+        self.changePersistentIndexList(
+            persistent,
+            [
+                self.createIndex(n.row, 0, n) if n.gen == self._gen else QModelIndex()
+                for n in persistent_nodes
+            ],
+        )
+        self.layoutChanged.emit()
+
+    def _fill(self, parent: _Node, rows: list, old: dict):
+        children = []
+        for row in rows:
+            node = old.pop(row["key"], None) or _Node(row["key"])
+            node.text = row["text"]
+            node.data = row["data"]
+            node.icon = row["icon"] if "icon" in row else _NO_ICON
+            node.parent = parent
+            node.row = len(children)
+            node.gen = self._gen
+            if node.icon:
+                self._by_icon.setdefault(node.icon, []).append(node)
+            self._fill(node, row.get("children", ()), old)
+            children.append(node)
+        parent.children = children
+
+    def icon_ready(self, path: str):
+        """Repaint the rows showing ``path`` once it has been loaded."""
+        for node in self._by_icon.get(path, ()):
+            idx = self.createIndex(node.row, 0, node)
+            self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+
+    def entries(self):
+        """``(key, text, parent_key)`` of every row, for the search index."""
+        stack = [(n, None) for n in self._root.children]
+        while stack:
+            node, parent_key = stack.pop()
+            yield node.key, node.text, parent_key
+            stack.extend((c, node.key) for c in node.children)
+
+
+class ChannelFilterProxy(QSortFilterProxyModel):
+    """Shows only rows whose key is in the current search result."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._visible = None
+
+    def set_visible(self, keys):
+        """``keys``: set of row keys to show, or None to show everything."""
+        if keys == self._visible:
+            return
+        self._visible = keys
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._visible is None:
+            return True
+        idx = self.sourceModel().index(source_row, 0, source_parent)
+        return idx.data(KEY_ROLE) in self._visible
+
+
+class IconRequestDelegate(QStyledItemDelegate):
+    """Requests a row's icon when the row is painted, i.e. when it is on screen."""
+
+    def __init__(self, request_icon, parent=None):
+        super().__init__(parent)
+        self._request_icon = request_icon
+
+    def paint(self, painter, option, index):
+        path = index.data(ICON_ROLE)
+        if path:
+            self._request_icon(path)
+        super().paint(painter, option, index)
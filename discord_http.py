@@ -0,0 +1,151 @@
+"""Shared HTTP transport for DiscordEmotify.
+
+Every background worker (guild/friends/channel loaders, image fetches and the
+reaction loop) goes through one ``DiscordHTTP`` instance so TCP/TLS
+connections to discord.com and cdn.discordapp.com are pooled and kept alive
+instead of being re-negotiated per action. API requests are additionally
+scheduled by a header-driven ``RateLimiter``.
+
+``requests`` (and urllib3 under it) is imported on first use rather than at
+module import, since it is one of the largest contributors to GUI start-up.
+"""
+
+import threading
+
+from ratelimit import RateLimiter
+
+API_BASE = "https://discord.com/api/v10"
+CDN_BASE = "https://cdn.discordapp.com"
+
+# Per-host pool limits: (mount prefix, max keep-alive connections).
+# The CDN gets a larger pool because icon/avatar bursts are highly parallel.
+DEFAULT_POOL_LIMITS = (
+    ("https://discord.com/", 8),
+    ("https://cdn.discordapp.com/", 16),
+)
+
+# How often a request that got a 429 is transparently retried.
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Image sizes the CDN serves (powers of two in this range)
+CDN_MIN_SIZE = 16
+CDN_MAX_SIZE = 4096
+
+
+def cdn_size(pixels: int) -> int:
+    """Smallest CDN ``size`` that covers ``pixels`` device pixels."""
+    size = CDN_MIN_SIZE
+    while size < pixels and size < CDN_MAX_SIZE:
+        size *= 2
+    return size
+
+
+def cdn_image_url(path: str, size: int, fmt: str = "png") -> str:
+    """URL of a CDN image such as ``avatars/<user>/<hash>`` at ``size`` px."""
+    return f"{CDN_BASE}/{path}.{fmt}?size={size}"
+
+
+class RequestCancelled(Exception):
+    """Raised when a caller's ``cancelled()`` fires while waiting for a rate-limit slot."""
+
+
+class DiscordHTTP:
+    """Thread-safe, connection-pooled HTTP client.
+
+    ``requests.Session`` is not guaranteed to be thread-safe, but its
+    ``HTTPAdapter`` (backed by a urllib3 pool manager) is. Each thread gets
+    its own lightweight session, and all of them mount the same adapters, so
+    keep-alive connections are shared process-wide while cookie/header state
+    stays per thread.
+
+    Requests to the Discord API wait for a slot from ``ratelimiter`` before
+    they are sent, feed the response headers back into it, and are retried
+    after the advertised delay when a 429 slips through anyway.
+    """
+
+    def __init__(self, user_agent: str, timeout: float = 15, pool_limits=None, ratelimiter=None):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.ratelimiter = ratelimiter or RateLimiter()
+        self._local = threading.local()
+        self._pool_limits = pool_limits or DEFAULT_POOL_LIMITS
+        self._init_lock = threading.Lock()
+        self._adapters = None
+        self._default_adapter = None
+
+    def warm_up(self):
+        """Import ``requests`` and build the shared adapters (idempotent)."""
+        if self._adapters is not None:
+            return
+        with self._init_lock:
+            if self._adapters is not None:
+                return
+            from requests.adapters import HTTPAdapter
+
+            adapters = []
+            for prefix, maxsize in self._pool_limits:
+                # pool_block keeps the number of sockets per host bounded; extra
+                # callers wait for a free connection instead of opening new ones.
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=maxsize, pool_block=True)
+                adapters.append((prefix, adapter))
+            # Fallback for any other host (kept small; not used in normal operation)
+            self._default_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            self._adapters = adapters
+
+    def _session(self):
+        sess = getattr(self._local, "session", None)
+        if sess is None:
+            self.warm_up()
+            import requests
+
+            sess = requests.Session()
+            sess.headers.update({"User-Agent": self.user_agent})
+            sess.mount("https://", self._default_adapter)
+            sess.mount("http://", self._default_adapter)
+            for prefix, adapter in self._adapters:
+                sess.mount(prefix, adapter)
+            self._local.session = sess
+        return sess
+
+    def request(self, method: str, url: str, min_interval: float = 0.0, cancelled=None, **kwargs):
+        """Send a request.
+
+        ``min_interval`` caps the rate of this route (seconds between request
+        starts) and ``cancelled`` is polled while waiting for a rate-limit
+        slot; ``RequestCancelled`` is raised if it returns True.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        sess = self._session()
+        if not url.startswith(API_BASE):
+            return sess.request(method, url, **kwargs)
+        limiter = self.ratelimiter
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            if not limiter.acquire(method, url, min_interval, cancelled):
+                raise RequestCancelled(url)
+            resp = sess.request(method, url, **kwargs)
+            limiter.update(method, url, resp)
+            # A 429 may advertise retry_after 0; it is still retried (the
+            # limiter holds the attempt until the advertised reset)
+            if resp.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                return resp
+        return resp
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        """Drop all pooled connections (e.g. on token change or shutdown)."""
+        if self._adapters is None:
+            return
+        for _, adapter in self._adapters:
+            adapter.close()
+        self._default_adapter.close()
@@ -0,0 +1,126 @@
+"""Persistent on-disk cache for guild icons and avatars.
+
+Discord CDN URLs embed the icon/avatar hash, so a given URL always serves the
+same bytes; entries never need revalidation and can be kept until the size
+budget forces them out (least recently used first).
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class DiskImageCache:
+    """Thread-safe, size-capped LRU store of raw image bytes keyed by URL.
+
+    The directory is scanned on first use rather than on construction, so
+    the scan runs on the image pool worker that first needs the cache
+    instead of delaying the window's first paint.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._scanned = False
+        self._entries = OrderedDict()  # file name -> size, oldest first
+        self._total = 0
+
+    @staticmethod
+    def _name(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".img"
+
+    def _ensure_scanned(self):
+        if self._scanned:
+            return
+        with self._scan_lock:
+            if self._scanned:
+                return
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self._scan()
+            except OSError:
+                # Unusable directory: behave as an always-empty cache
+                self.directory = None
+            self._scanned = True
+
+    def _scan(self):
+        found = []
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if not e.name.endswith(".img"):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                found.append((st.st_mtime, e.name, st.st_size))
+        found.sort()
+        with self._lock:
+            for _mtime, name, size in found:
+                self._entries[name] = size
+                self._total += size
+            self._evict()
+
+    def get(self, url: str):
+        """Return cached bytes for ``url`` or None."""
+        self._ensure_scanned()
+        if self.directory is None:
+            return None
+        name = self._name(url)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # mtime doubles as the LRU timestamp across launches
+            os.utime(path)
+            return data
+        except OSError:
+            with self._lock:
+                size = self._entries.pop(name, None)
+                if size is not None:
+                    self._total -= size
+            return None
+
+    def put(self, url: str, data: bytes):
+        self._ensure_scanned()
+        if self.directory is None or not data or len(data) > self.max_bytes:
+            return
+        name = self._name(url)
+        path = os.path.join(self.directory, name)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            old = self._entries.pop(name, None)
+            if old is not None:
+                self._total -= old
+            self._entries[name] = len(data)
+            self._total += len(data)
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock
+        while self._total > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
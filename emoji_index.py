@@ -0,0 +1,197 @@
+"""Name index of the custom emojis in the user's guilds.
+
+Resolving ``:custom_name:`` used to walk the guilds one blocking GET at a time
+until the name turned up, so a typo cost one request per guild. This index maps
+lower-cased names to every ``(guild_id, emoji_id, animated)`` that carries
+them. It is filled in the background right after the guild list loads, with a
+few guilds fetched concurrently, and persisted to disk so later sessions start
+warm. A guild's emoji list is refetched once it is older than
+``REFRESH_AFTER``; until then lookups cost no requests.
+
+Exact lookups are a dict access; prefix matches (for autocomplete) bisect a
+sorted list of names.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from discord_http import API_BASE
+
+# Guild emoji lists older than this are refetched on the next refresh
+REFRESH_AFTER = 24 * 3600
+# Concurrent GET /guilds/{id}/emojis requests while refreshing
+FETCH_WORKERS = 4
+
+
+class CustomEmojiIndex:
+    """Thread-safe ``name -> [(guild_id, emoji_id, animated), ...]`` map."""
+
+    def __init__(self, path: str = None, refresh_after: float = REFRESH_AFTER):
+        self.path = path
+        self.refresh_after = refresh_after
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        # guild_id -> {"fetched_at": ts, "emojis": [[name, id, animated], ...]}
+        self._guilds = {}
+        self._by_name = {}
+        self._sorted_names = None  # rebuilt lazily for prefix queries
+        self._load()
+
+    # ---- persistence ----
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        guilds = data.get("guilds") if isinstance(data, dict) else None
+        if not isinstance(guilds, dict):
+            return
+        for gid, entry in guilds.items():
+            if isinstance(entry, dict) and isinstance(entry.get("emojis"), list):
+                self._set(str(gid), entry["emojis"], entry.get("fetched_at", 0))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps({"version": 1, "guilds": self._guilds}, ensure_ascii=False)
+        tmp = f"{self.path}.tmp"
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+    # ---- updates ----
+    def _set(self, guild_id: str, emojis, fetched_at: float):
+        """Replace one guild's entries; caller holds the lock (or is __init__)."""
+        old = self._guilds.get(guild_id)
+        if old:
+            for name, _eid, _anim in old["emojis"]:
+                refs = self._by_name.get(name.lower())
+                if refs:
+                    refs[:] = [r for r in refs if r[0] != guild_id]
+                    if not refs:
+                        del self._by_name[name.lower()]
+        rows = []
+        for e in emojis:
+            name, eid, animated = e
+            if not name or not eid:
+                continue
+            rows.append([str(name), str(eid), bool(animated)])
+            self._by_name.setdefault(str(name).lower(), []).append(
+                (guild_id, str(eid), bool(animated))
+            )
+        self._guilds[guild_id] = {"fetched_at": fetched_at, "emojis": rows}
+        self._sorted_names = None
+
+    def set_guild(self, guild_id: str, api_emojis):
+        """Store a guild's ``GET /guilds/{id}/emojis`` payload."""
+        rows = [(e.get("name"), e.get("id"), e.get("animated")) for e in api_emojis or ()]
+        with self._lock:
+            self._set(str(guild_id), rows, time.time())
+
+    def retain(self, guild_ids):
+        """Drop guilds the user is no longer in."""
+        keep = {str(g) for g in guild_ids}
+        with self._lock:
+            for gid in [g for g in self._guilds if g not in keep]:
+                self._set(gid, (), 0)
+                del self._guilds[gid]
+
+    # ---- queries ----
+    def missing(self, guild_ids):
+        """Guild IDs that have never been indexed."""
+        with self._lock:
+            return [str(g) for g in guild_ids if str(g) not in self._guilds]
+
+    def stale(self, guild_ids):
+        """Guild IDs that are missing or older than ``refresh_after``."""
+        cutoff = time.time() - self.refresh_after
+        with self._lock:
+            return [
+                str(g)
+                for g in guild_ids
+                if self._guilds.get(str(g), {}).get("fetched_at", 0) < cutoff
+            ]
+
+    def lookup(self, name: str):
+        """All ``(guild_id, emoji_id, animated)`` for ``name`` (case-insensitive)."""
+        with self._lock:
+            return list(self._by_name.get(name.lower(), ()))
+
+    def resolve(self, name: str, guild_ids=None, preferred_guild_id=None):
+        """``"name:id"`` for ``name``, preferring ``preferred_guild_id``, then
+        the order of ``guild_ids`` (only guilds in it are considered when given)."""
+        refs = self.lookup(name)
+        if not refs:
+            return None
+        rank = {str(g): i for i, g in enumerate(guild_ids)} if guild_ids is not None else None
+        if rank is not None:
+            refs = [r for r in refs if r[0] in rank]
+        if not refs:
+            return None
+        pref = str(preferred_guild_id) if preferred_guild_id else None
+        refs.sort(key=lambda r: (r[0] != pref, rank.get(r[0], 0) if rank else 0))
+        gid, eid, _animated = refs[0]
+        with self._lock:
+            rows = self._guilds.get(gid, {}).get("emojis", ())
+            real = next((n for n, i, _a in rows if i == eid), name)
+        return f"{real}:{eid}"
+
+    def complete(self, prefix: str, limit: int = 20):
+        """Up to ``limit`` lower-cased names starting with ``prefix``."""
+        prefix = prefix.lower()
+        with self._lock:
+            if self._sorted_names is None:
+                self._sorted_names = sorted(self._by_name)
+            names = self._sorted_names
+        out = []
+        for i in range(bisect.bisect_left(names, prefix), len(names)):
+            if not names[i].startswith(prefix) or len(out) >= limit:
+                break
+            out.append(names[i])
+        return out
+
+    # ---- fetching ----
+    def refresh(self, http, token: str, guild_ids, workers: int = FETCH_WORKERS, cancelled=None):
+        """Fetch ``guild_ids`` with bounded concurrency, then save.
+
+        Guilds whose request fails keep their previous entry (or stay missing)
+        and are retried on the next refresh. Returns the number fetched.
+        """
+        guild_ids = [str(g) for g in guild_ids]
+        if not guild_ids:
+            return 0
+        headers = {"Authorization": token}
+
+        def fetch(gid):
+            if cancelled is not None and cancelled():
+                return False
+            try:
+                r = http.get(f"{API_BASE}/guilds/{gid}/emojis", headers=headers, cancelled=cancelled)
+            except Exception:
+                return False
+            if r.ok:
+                self.set_guild(gid, r.json())
+            elif r.status_code == 404:
+                self.set_guild(gid, [])
+            else:
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(guild_ids)))) as pool:
+            done = sum(pool.map(fetch, guild_ids))
+        if done:
+            self.save()
+        return done
@@ -0,0 +1,41 @@
+"""Emoji resolution without Qt.
+
+Turns user input tokens into the form the reactions endpoint expects:
+unicode emoji, ``:shortcode:`` (via the optional ``emoji`` package),
+``:custom_name:`` (looked up in the user's guilds) or an explicit ``name:id``.
+Input is split into tokens by ``emoji_tokenizer``.
+"""
+
+from emoji_tokenizer import SHORTCODE_RE, get_tokenizer
+
+
+def unicode_for_shortcode(name: str):
+    """Unicode emoji for a standard shortcode such as ``smile``, or None."""
+    return get_tokenizer().unicode_for(name)
+
+
+def find_custom_emoji(http, token: str, name: str, guild_ids, index, preferred_guild_id=None):
+    """``"name:id"`` of a custom emoji called ``name`` in ``guild_ids``, or None.
+
+    ``index`` is a ``CustomEmojiIndex``. Guilds it has never seen are fetched
+    first (concurrently); after that a lookup, hit or miss, costs no requests.
+    """
+    index.refresh(http, token, index.missing(guild_ids))
+    return index.resolve(name, guild_ids, preferred_guild_id)
+
+
+def resolve_emoji(text: str, custom_lookup=None):
+    """API form of one token, or None if it cannot be resolved.
+
+    ``custom_lookup(name)`` is tried for ``:name:`` tokens that are not
+    standard shortcodes.
+    """
+    m = SHORTCODE_RE.fullmatch(text)
+    if not m:
+        # Unicode emoji or name:id are used as-is
+        return text
+    name = m.group(1)
+    uni = unicode_for_shortcode(name)
+    if uni:
+        return uni
+    return custom_lookup(name) if custom_lookup is not None else None
@@ -0,0 +1,138 @@
+"""Emoji input tokenizer.
+
+Splits the emoji field (``"😀👍🏽 :fire: blob:123,🏳️‍🌈"``) into tokens. Unicode
+emoji are matched against a trie built once from ``emoji.EMOJI_DATA``, always
+taking the longest sequence, so ZWJ sequences, skin tones, keycaps and flags
+stay whole even with no separators between them. The same pass builds a
+shortcode → unicode dict (``en`` names and aliases) so shortcodes resolve
+with a dict lookup instead of going through ``emoji.emojize``.
+
+Tokenizing is linear in the input: each step either consumes the characters
+it matched or a single character, and a trie walk is bounded by the longest
+emoji sequence (a handful of code points).
+"""
+
+import re
+import threading
+
+ZWJ = "\u200d"
+VS16 = "\ufe0f"
+# Fitzpatrick skin-tone modifiers, appended to sequences the data may lack
+SKIN_TONES = frozenset(chr(c) for c in range(0x1F3FB, 0x1F400))
+SEPARATORS = frozenset(" \t\r\n,")
+
+_END = ""  # trie key marking the end of a complete sequence (never a char)
+
+NAME_ID_RE = re.compile(r"[A-Za-z0-9_]+:[0-9]+")
+SHORTCODE_RE = re.compile(r":([^\s:,]+):")
+
+
+class EmojiTokenizer:
+    """Longest-match emoji trie plus shortcode dict; immutable once built."""
+
+    def __init__(self, emoji_data=None):
+        self._root = {}
+        self.shortcodes = {}
+        for uni, info in (emoji_data or {}).items():
+            self._add(uni)
+            for code in [info.get("en")] + list(info.get("alias") or ()):
+                if code and code.startswith(":") and code.endswith(":"):
+                    self.shortcodes.setdefault(code[1:-1], uni)
+
+    def _add(self, seq: str):
+        node = self._root
+        for ch in seq:
+            node = node.setdefault(ch, {})
+        node[_END] = True
+
+    def _match_known(self, text: str, pos: int) -> int:
+        """End index of the longest sequence in the data starting at ``pos``."""
+        node = self._root
+        end = pos
+        i, n = pos, len(text)
+        while i < n:
+            node = node.get(text[i])
+            if node is None:
+                break
+            i += 1
+            if _END in node:
+                end = i
+        return end
+
+    def match(self, text: str, pos: int) -> int:
+        """End index of the longest emoji starting at ``pos`` (``pos`` if none)."""
+        end = self._match_known(text, pos)
+        if end == pos:
+            return pos
+        # Extend with what newer inputs may carry beyond the installed data:
+        # a stray VS16, a skin tone, or further ZWJ-joined emoji. Iterative, so
+        # an arbitrarily long pasted ZWJ chain is one linear scan
+        n = len(text)
+        while end < n:
+            ch = text[end]
+            if ch == VS16 or ch in SKIN_TONES:
+                end += 1
+            elif ch == ZWJ and end + 1 < n:
+                nxt = self._match_known(text, end + 1)
+                if nxt == end + 1:
+                    break
+                end = nxt
+            else:
+                break
+        return end
+
+    def unicode_for(self, name: str):
+        """Unicode emoji for a shortcode without colons (``thumbsup``), or None."""
+        return self.shortcodes.get(name) or self.shortcodes.get(name.lower())
+
+    def tokenize(self, text: str):
+        """Split ``text`` into emoji, ``:shortcode:`` and ``name:id`` tokens.
+
+        Separators (spaces/commas) are optional. Anything unrecognised is kept
+        as a run of characters up to the next separator or emoji.
+        """
+        tokens = []
+        i, n = 0, len(text or "")
+        while i < n:
+            ch = text[i]
+            if ch in SEPARATORS:
+                i += 1
+                continue
+            m = NAME_ID_RE.match(text, i) or SHORTCODE_RE.match(text, i)
+            if m:
+                tokens.append(m.group(0))
+                i = m.end()
+                continue
+            j = self.match(text, i)
+            if j > i:
+                tokens.append(text[i:j])
+                i = j
+                continue
+            j = i + 1
+            while j < n and text[j] not in SEPARATORS and self.match(text, j) == j:
+                j += 1
+            tokens.append(text[i:j])
+            i = j
+        return tokens
+
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer() -> EmojiTokenizer:
+    """Shared tokenizer, built on first use (empty if ``emoji`` is missing)."""
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                try:
+                    from emoji import EMOJI_DATA
+                except Exception:
+                    EMOJI_DATA = None
+                _tokenizer = EmojiTokenizer(EMOJI_DATA)
+    return _tokenizer
+
+
+def tokenize_emojis(text: str):
+    return get_tokenizer().tokenize(text)
@@ -0,0 +1,242 @@
+"""Headless command-line entry point for DiscordEmotify.
+
+Runs one reaction job without importing PyQt5 and reports progress as
+line-delimited JSON on stdout, e.g.::
+
+    DISCORD_TOKEN=... python emotify_cli.py --channel 123 --emoji "😀 :fire: blob:456"
+
+Each line is one JSON object with an ``event`` field: ``start``, ``progress``,
+``error`` or ``done``. Exit status is 0 when the run completed or hit
+``--max``, 1 on failure and 130 when interrupted.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from app_info import USER_AGENT, __version__
+
+# Same bounds as the GUI's reactions/sec control; Discord's rate-limit
+# headers still decide the real pace below this cap.
+MIN_RATE = 1
+MAX_RATE = 20
+
+
+def _emit(obj: dict):
+    sys.stdout.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def _parse_time(value: str) -> int:
+    """ISO-8601 date/datetime (local time if no offset) → unix milliseconds."""
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO date/time: {value!r}")
+    return int(dt.timestamp() * 1000)
+
+
+def _rate(value: str) -> float:
+    rate = float(value)
+    if not MIN_RATE <= rate <= MAX_RATE:
+        raise argparse.ArgumentTypeError(f"rate must be between {MIN_RATE} and {MAX_RATE}")
+    return rate
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="emotify_cli",
+        description="React to (or clear reactions on) messages in a Discord channel.",
+    )
+    p.add_argument("--channel", required=True, help="channel or DM channel ID")
+    p.add_argument(
+        "--emoji",
+        action="append",
+        required=True,
+        help="emoji(s): unicode, :shortcode:, :custom_name: or name:id; repeatable",
+    )
+    p.add_argument("--order", choices=("newest", "oldest"), default="newest")
+    p.add_argument("--clear", action="store_true", help="remove reactions instead")
+    p.add_argument("--max", type=int, default=0, help="max messages (0 = all)")
+    p.add_argument(
+        "--rate",
+        type=_rate,
+        default=MIN_RATE,
+        help="upper bound in reactions/sec (Discord's rate limits still apply)",
+    )
+    p.add_argument("--since", type=_parse_time, help="only messages at/after this ISO time")
+    p.add_argument("--until", type=_parse_time, help="only messages at/before this ISO time")
+    p.add_argument("--author", action="append", default=[], help="only these author IDs")
+    kind = p.add_mutually_exclusive_group()
+    kind.add_argument("--humans", action="store_true", help="only messages from humans")
+    kind.add_argument("--bots", action="store_true", help="only messages from bots")
+    p.add_argument("--regex", default="", help="only messages whose content matches")
+    p.add_argument(
+        "--type",
+        action="append",
+        choices=("regular", "replies"),
+        default=[],
+        help="only messages of this type; repeatable (default: any type)",
+    )
+    p.add_argument("--attachments", action="store_true", help="only messages with attachments/embeds")
+    p.add_argument("--pinned", action="store_true", help="only pinned messages")
+    p.add_argument("--guild", action="append", default=[], help="guild ID(s) to search for :custom_name: emojis")
+    p.add_argument("--resume", action="store_true", help="continue an interrupted run of the same job")
+    p.add_argument("--no-index", action="store_true", help="do not use the local message index")
+    p.add_argument("--token", help="Discord token (default: $DISCORD_TOKEN)")
+    p.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    return p
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    token = args.token or os.environ.get("DISCORD_TOKEN", "")
+    if not token:
+        _emit({"event": "error", "error": "No token (use --token or DISCORD_TOKEN)"})
+        return 1
+
+    # Networking/engine imports only; PyQt5 is never loaded
+    from app_paths import message_index_path, user_cache_dir, user_data_dir
+    from discord_http import API_BASE, DiscordHTTP
+    from emoji_index import CustomEmojiIndex
+    from emoji_resolver import find_custom_emoji, resolve_emoji
+    from emoji_tokenizer import tokenize_emojis
+    from message_filters import (
+        AUTHOR_ANY,
+        AUTHOR_BOTS,
+        AUTHOR_HUMANS,
+        TYPE_DEFAULT,
+        TYPE_REPLY,
+        MessageFilter,
+    )
+    from reaction_engine import (
+        CANCELLED,
+        COMPLETED,
+        DONE,
+        LIMIT,
+        CancelToken,
+        ReactionEngine,
+        ReactionJob,
+    )
+    from run_journal import RunJournal
+    from snowflakes import range_bounds
+
+    http = DiscordHTTP(USER_AGENT)
+
+    guild_ids = list(args.guild)
+    emoji_index = None
+
+    def custom_lookup(name):
+        nonlocal emoji_index
+        if emoji_index is None:
+            if not guild_ids:
+                try:
+                    r = http.get(f"{API_BASE}/users/@me/guilds", headers={"Authorization": token})
+                    guild_ids.extend(str(g.get("id")) for g in (r.json() if r.ok else []))
+                except Exception:
+                    pass
+            # Shared with the GUI; refresh what is out of date once per run
+            emoji_index = CustomEmojiIndex(os.path.join(user_cache_dir(), "custom_emojis.json"))
+            emoji_index.refresh(http, token, emoji_index.stale(guild_ids))
+        return find_custom_emoji(http, token, name, guild_ids, emoji_index)
+
+    tokens = [t for raw in args.emoji for t in tokenize_emojis(raw)]
+    resolved, not_found = [], []
+    for t in tokens:
+        r = resolve_emoji(t, custom_lookup)
+        (resolved if r else not_found).append(r or t)
+    if not resolved:
+        _emit({"event": "error", "error": "No valid emoji", "not_found": not_found})
+        return 1
+
+    try:
+        msg_filter = MessageFilter(
+            author_ids=args.author,
+            author_kind=AUTHOR_BOTS if args.bots else AUTHOR_HUMANS if args.humans else AUTHOR_ANY,
+            has_attachments=args.attachments,
+            pinned_only=args.pinned,
+            content_regex=args.regex,
+            types=[{"regular": TYPE_DEFAULT, "replies": TYPE_REPLY}[t] for t in args.type],
+        )
+    except Exception as e:
+        _emit({"event": "error", "error": f"Invalid regex: {e}"})
+        return 1
+    range_after, range_before = (
+        range_bounds(args.since, args.until) if (args.since or args.until) else (None, None)
+    )
+    job = ReactionJob(
+        args.channel,
+        resolved,
+        clear=args.clear,
+        oldest_first=args.order == "oldest",
+        max_messages=max(0, args.max),
+        rate=args.rate,
+        msg_filter=None if msg_filter.is_empty() else msg_filter,
+        range_after=range_after,
+        range_before=range_before,
+    )
+
+    journal = RunJournal(os.path.join(user_data_dir(), "journal.json"))
+    journal.set_scope(token)
+    if args.resume:
+        saved = journal.get(job.key())
+        if saved and saved.get("last_id"):
+            job.resume_from = saved["last_id"]
+            job.processed_before = int(saved.get("processed", 0))
+    index = None
+    index_path = message_index_path(token)
+    if not args.no_index:
+        try:
+            from message_index import MessageIndex
+
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            index = MessageIndex(index_path)
+        except Exception:
+            index = None
+    elif os.path.exists(index_path):
+        # This run changes reactions the index would still report; make the
+        # next indexed run re-read the channel instead of skipping on stale state
+        try:
+            from message_index import MessageIndex
+
+            stale = MessageIndex(index_path)
+            stale.forget_channel(job.channel_id)
+            stale.close()
+        except Exception:
+            pass
+
+    _emit(
+        {
+            "event": "start",
+            "channel": job.channel_id,
+            "emojis": resolved,
+            "not_found": not_found,
+            "resume_from": job.resume_from,
+        }
+    )
+    cancel = CancelToken()
+    engine = ReactionEngine(http, token, journal=journal, index=index)
+    reason = None
+    events = engine.run(job, cancel)
+    while True:
+        try:
+            ev = next(events)
+        except StopIteration:
+            break
+        except KeyboardInterrupt:
+            # The engine unwinds (closing the pager, flushing the journal)
+            cancel.cancel()
+            _emit({"event": DONE, "reason": CANCELLED})
+            break
+        _emit(ev.as_dict())
+        if ev.kind == DONE:
+            reason = ev.reason
+    if reason in (COMPLETED, LIMIT):
+        return 0
+    return 130 if cancel.cancelled() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
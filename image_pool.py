@@ -0,0 +1,115 @@
+"""Bounded, prioritized image download pool.
+
+Replaces the old one-thread-per-icon approach: a fixed number of worker
+threads pull URLs from a priority queue, so a friends list with hundreds of
+avatars never spawns hundreds of threads, and whatever the user can see is
+fetched first. Pending (not yet started) downloads can be promoted when their
+rows come into view, or cancelled when the rows scroll away or are removed.
+"""
+
+import heapq
+import itertools
+import threading
+
+# Lower value = fetched sooner.
+PRIORITY_SIDEBAR = 0
+PRIORITY_VISIBLE = 1
+PRIORITY_OFFSCREEN = 2
+
+_REMOVED = object()
+
+
+class ImageFetchPool:
+    """Fixed-size worker pool that downloads image bytes in priority order.
+
+    ``on_done(key, data)`` is invoked from a worker thread with the raw bytes
+    (``b""`` on failure); callers marshal back to the UI thread themselves,
+    e.g. by emitting a Qt signal. If a ``disk_cache`` is given it is consulted
+    before the network and filled after every successful download.
+    """
+
+    def __init__(self, http, on_done, workers: int = 6, disk_cache=None):
+        self._http = http
+        self._on_done = on_done
+        self._disk_cache = disk_cache
+        self._heap = []
+        self._entries = {}  # key -> [priority, seq, key, url]
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._threads = []
+        for i in range(max(1, workers)):
+            t = threading.Thread(
+                target=self._run, name=f"image-fetch-{i}", daemon=True
+            )
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, key: str, url: str, priority: int = PRIORITY_OFFSCREEN):
+        """Queue ``url`` under ``key``; a duplicate key only raises priority."""
+        with self._cv:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if priority < entry[0]:
+                    self._push(key, url, priority)
+                return
+            self._push(key, url, priority)
+            self._cv.notify()
+
+    def reprioritize(self, key: str, priority: int) -> bool:
+        """Raise the priority of a pending download (never lowers it, like
+        ``submit``). Returns False if not pending."""
+        with self._cv:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= priority:
+                return entry is not None
+            self._push(key, entry[3], priority)
+            return True
+
+    def cancel(self, key: str) -> bool:
+        """Drop a pending download. In-flight downloads are not interrupted."""
+        with self._cv:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            entry[2] = _REMOVED
+            return True
+
+    def pending(self) -> int:
+        with self._cv:
+            return len(self._entries)
+
+    def _push(self, key: str, url: str, priority: int):
+        # Caller holds the lock. Old entries are invalidated lazily.
+        old = self._entries.get(key)
+        if old is not None:
+            old[2] = _REMOVED
+        entry = [priority, next(self._seq), key, url]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _next(self):
+        with self._cv:
+            while True:
+                while self._heap:
+                    _, _, key, url = heapq.heappop(self._heap)
+                    if key is not _REMOVED:
+                        del self._entries[key]
+                        return key, url
+                self._cv.wait()
+
+    def _run(self):
+        while True:
+            key, url = self._next()
+            data = self._disk_cache.get(url) if self._disk_cache else None
+            if data is None:
+                try:
+                    r = self._http.get(url)
+                    data = r.content if r.status_code == 200 else b""
+                except Exception:
+                    data = b""
+                if data and self._disk_cache:
+                    self._disk_cache.put(url, data)
+            try:
+                self._on_done(key, data)
+            except Exception:
+                pass
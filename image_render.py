@@ -0,0 +1,70 @@
+"""Icon decoding and rendering on ``QImage``, safe to run off the GUI thread.
+
+``QPixmap`` may only be used on the GUI thread, so decoding a downloaded
+avatar, scaling it and clipping it to a circle used to happen there, once per
+icon. Doing the same work on ``QImage`` lets the download workers hand back a
+finished image; the GUI thread only converts it with ``QPixmap.fromImage``.
+"""
+
+from functools import lru_cache
+
+from PyQt5.QtCore import QPoint, Qt
+from PyQt5.QtGui import QImage, QPainter, QPainterPath
+
+_FORMAT = QImage.Format_ARGB32_Premultiplied
+
+
+@lru_cache(maxsize=16)
+def circle_mask(size: int) -> QImage:
+    """Opaque white antialiased disc on transparent, ``size``×``size``.
+
+    Rendered once per size and shared (read-only) by every circular icon, so
+    masking an icon is a single composition instead of a path clip.
+    """
+    mask = QImage(size, size, _FORMAT)
+    mask.fill(Qt.transparent)
+    p = QPainter(mask)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.setPen(Qt.NoPen)
+    p.setBrush(Qt.white)
+    path = QPainterPath()
+    path.addEllipse(0, 0, size, size)
+    p.drawPath(path)
+    p.end()
+    return mask
+
+
+def circular_image(image: QImage, size: int) -> QImage:
+    """``size``×``size`` copy of ``image`` cropped to a circle (antialiased)."""
+    if image.isNull():
+        return QImage()
+    scaled = image.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    rounded = QImage(size, size, _FORMAT)
+    rounded.fill(Qt.transparent)
+    p = QPainter(rounded)
+    p.drawImage(QPoint(0, 0), scaled)
+    p.setCompositionMode(QPainter.CompositionMode_DestinationIn)
+    p.drawImage(QPoint(0, 0), circle_mask(size))
+    p.end()
+    return rounded
+
+
+def render_image(source: QImage, size: int, circular: bool) -> QImage:
+    """Produce a size×size rendition of a decoded source image."""
+    if circular:
+        return circular_image(source, size)
+    return source.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def decode_icon(data: bytes, size: int, circular: bool):
+    """Decode downloaded bytes and render one variant.
+
+    Returns ``(source, rendition)``; both are null images if ``data`` is empty
+    or not a decodable image.
+    """
+    source = QImage.fromData(data) if data else QImage()
+    if source.isNull():
+        return QImage(), QImage()
+    if source.format() != _FORMAT:
+        source = source.convertToFormat(_FORMAT)
+    return source, render_image(source, size, circular)
@@ -0,0 +1,82 @@
+"""Stale-while-revalidate cache for the friends list and guild channel lists.
+
+Opening a guild (or Friends) renders the last known list straight from memory
+or disk while a background request fetches the current one; the view then
+applies only what changed. Entries are scoped to the signed-in account (a hash
+of the token), so switching accounts never shows another user's lists.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from app_paths import account_scope
+
+# Lists kept in memory (the disk copy has no limit beyond one file per list)
+MAX_MEMORY_ENTRIES = 64
+
+
+class ListCache:
+    """Thread-safe ``key -> JSON-serializable list`` store, memory over disk."""
+
+    def __init__(self, directory: str = None, max_memory: int = MAX_MEMORY_ENTRIES):
+        self.directory = directory
+        self.max_memory = max_memory
+        self._lock = threading.Lock()
+        self._mem = OrderedDict()
+        self._scope = ""
+
+    def set_scope(self, token: str):
+        """Switch to the lists of the account identified by ``token``."""
+        scope = account_scope(token)
+        with self._lock:
+            if scope != self._scope:
+                self._scope = scope
+                self._mem.clear()
+
+    def _path(self, key: str):
+        if not self.directory or not self._scope:
+            return None
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(self.directory, self._scope, name)
+
+    def get(self, key: str):
+        """Last stored list for ``key`` or None."""
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                return self._mem[key]
+            path = self._path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data):
+        self._remember(key, data)
+        with self._lock:
+            path = self._path(key)
+        if path is None:
+            return
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _remember(self, key: str, data):
+        with self._lock:
+            self._mem[key] = data
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_memory:
+                self._mem.popitem(last=False)
@@ -0,0 +1,87 @@
+"""Message predicates evaluated on page payloads before any reaction is sent.
+
+Everything checked here is already present in the message objects returned by
+``GET /channels/{id}/messages`` (or in the local index), so filtering costs no
+requests: only matching messages spend rate-limited reaction calls.
+"""
+
+import re
+
+AUTHOR_ANY = "any"
+AUTHOR_HUMANS = "humans"
+AUTHOR_BOTS = "bots"
+
+# Discord message types (https://discord.com/developers/docs/resources/message#message-object-message-types)
+TYPE_DEFAULT = 0
+TYPE_REPLY = 19
+
+
+class MessageFilter:
+    """Conjunction of optional predicates; an empty filter matches everything."""
+
+    def __init__(
+        self,
+        author_ids=None,
+        author_kind: str = AUTHOR_ANY,
+        has_attachments: bool = False,
+        pinned_only: bool = False,
+        content_regex: str = "",
+        types=None,
+    ):
+        self.author_ids = {str(a) for a in author_ids or () if str(a).strip()}
+        self.author_kind = author_kind or AUTHOR_ANY
+        self.has_attachments = bool(has_attachments)
+        self.pinned_only = bool(pinned_only)
+        self.content_regex = content_regex or ""
+        # re.error propagates so the caller can report an invalid pattern
+        self._content_re = re.compile(self.content_regex) if self.content_regex else None
+        self.types = {int(t) for t in types} if types else set()
+
+    @classmethod
+    def parse_ids(cls, text: str):
+        """Split a comma/space separated list of user IDs, ignoring anything else."""
+        return [t for t in re.split(r"[\s,]+", text or "") if t.isdigit()]
+
+    def is_empty(self) -> bool:
+        return not (
+            self.author_ids
+            or self.author_kind != AUTHOR_ANY
+            or self.has_attachments
+            or self.pinned_only
+            or self._content_re
+            or self.types
+        )
+
+    def spec(self):
+        """JSON-serializable description, used to tell jobs apart for resuming."""
+        if self.is_empty():
+            return None
+        return {
+            "authors": sorted(self.author_ids),
+            "kind": self.author_kind,
+            "attachments": self.has_attachments,
+            "pinned": self.pinned_only,
+            "regex": self.content_regex,
+            "types": sorted(self.types),
+        }
+
+    def matches(self, m: dict) -> bool:
+        # Cheapest checks first; the regex runs last
+        if self.types and m.get("type", 0) not in self.types:
+            return False
+        if self.pinned_only and not m.get("pinned"):
+            return False
+        author = m.get("author") or {}
+        if self.author_ids and str(author.get("id")) not in self.author_ids:
+            return False
+        if self.author_kind == AUTHOR_BOTS and not author.get("bot"):
+            return False
+        if self.author_kind == AUTHOR_HUMANS and author.get("bot"):
+            return False
+        if self.has_attachments and not (m.get("attachments") or m.get("embeds")):
+            return False
+        if self._content_re is not None and not self._content_re.search(
+            m.get("content") or ""
+        ):
+            return False
+        return True
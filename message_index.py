@@ -0,0 +1,308 @@
+"""Local SQLite index of channel messages with incremental sync.
+
+Each page fetched from the API is stored (slimmed down to the fields the
+reaction pipeline needs) together with the snowflake interval it proves
+complete. Later runs over the same channel read covered ranges from disk and
+only hit the API for gaps and for messages newer than the last sync, so e.g.
+a react pass followed by a clear pass costs one history scan instead of two.
+"""
+
+import json
+import threading
+
+from pipeline import emoji_key, emoji_object, reaction_emoji_key
+
+PAGE_SIZE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    channel_id TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (channel_id, message_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    channel_id TEXT NOT NULL,
+    lo INTEGER NOT NULL,
+    hi INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_channel ON coverage (channel_id, lo);
+"""
+
+
+def slim_message(m: dict) -> dict:
+    """Keep only what reaction planning and message filters look at."""
+    author = m.get("author") or {}
+    return {
+        "id": str(m.get("id")),
+        "type": m.get("type", 0),
+        "pinned": bool(m.get("pinned")),
+        "content": m.get("content") or "",
+        "author": {"id": author.get("id"), "bot": bool(author.get("bot"))},
+        "attachments": [{"id": a.get("id")} for a in m.get("attachments") or ()],
+        "embeds": [{"type": e.get("type")} for e in m.get("embeds") or ()],
+        "reactions": [
+            {
+                "emoji": {
+                    "id": (r.get("emoji") or {}).get("id"),
+                    "name": (r.get("emoji") or {}).get("name"),
+                },
+                "me": bool(r.get("me")),
+            }
+            for r in m.get("reactions") or ()
+        ],
+    }
+
+
+class MessageIndex:
+    """Thread-safe store of message snapshots and the ranges known to be complete.
+
+    Coverage is a set of disjoint, inclusive ``[lo, hi]`` snowflake intervals
+    per channel; ``lo == 0`` means the interval reaches the start of the
+    channel.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Imported here: the GUI loads this module at start-up but opens the
+        # index only on first use
+        import sqlite3
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ---- coverage ----
+    def _intervals(self, channel_id: str):
+        return self._db.execute(
+            "SELECT lo, hi FROM coverage WHERE channel_id = ? ORDER BY lo",
+            (channel_id,),
+        ).fetchall()
+
+    def interval_containing(self, channel_id: str, snowflake: int):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT lo, hi FROM coverage WHERE channel_id = ? AND lo <= ? AND hi >= ?",
+                (channel_id, snowflake, snowflake),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def newest_interval(self, channel_id: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT lo, hi FROM coverage WHERE channel_id = ? ORDER BY hi DESC LIMIT 1",
+                (channel_id,),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def store_page(self, channel_id: str, msgs, lo: int, hi: int):
+        """Save a page and mark ``[lo, hi]`` as complete (merging neighbours)."""
+        rows = [
+            (channel_id, int(m["id"]), json.dumps(slim_message(m), ensure_ascii=False))
+            for m in msgs
+            if m.get("id")
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO messages (channel_id, message_id, payload) VALUES (?, ?, ?)",
+                rows,
+            )
+            if lo > hi:
+                return
+            merged_lo, merged_hi = lo, hi
+            for a, b in self._intervals(channel_id):
+                if a <= merged_hi + 1 and b + 1 >= merged_lo:
+                    merged_lo, merged_hi = min(a, merged_lo), max(b, merged_hi)
+            self._db.execute(
+                "DELETE FROM coverage WHERE channel_id = ? AND lo >= ? AND hi <= ?",
+                (channel_id, merged_lo, merged_hi),
+            )
+            self._db.execute(
+                "INSERT INTO coverage (channel_id, lo, hi) VALUES (?, ?, ?)",
+                (channel_id, merged_lo, merged_hi),
+            )
+
+    # ---- messages ----
+    def read_range(self, channel_id: str, lo: int, hi: int, descending: bool, limit: int = PAGE_SIZE):
+        order = "DESC" if descending else "ASC"
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT payload FROM messages WHERE channel_id = ? AND message_id BETWEEN ? AND ? "
+                f"ORDER BY message_id {order} LIMIT ?",
+                (channel_id, lo, hi, limit),
+            ).fetchall()
+        return [json.loads(p) for (p,) in rows]
+
+    def set_reaction(self, channel_id: str, message_id: str, api_emoji: str, me: bool):
+        """Reflect a reaction we just added/removed so later passes plan correctly."""
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT payload FROM messages WHERE channel_id = ? AND message_id = ?",
+                (channel_id, int(message_id)),
+            ).fetchone()
+            if not row:
+                return
+            payload = json.loads(row[0])
+            reactions = payload.setdefault("reactions", [])
+            key = emoji_key(api_emoji)
+            for r in reactions:
+                if reaction_emoji_key(r.get("emoji") or {}) == key:
+                    r["me"] = me
+                    break
+            else:
+                if me:
+                    reactions.append({"emoji": emoji_object(api_emoji), "me": True})
+            self._db.execute(
+                "UPDATE messages SET payload = ? WHERE channel_id = ? AND message_id = ?",
+                (json.dumps(payload, ensure_ascii=False), channel_id, int(message_id)),
+            )
+
+    def forget_channel(self, channel_id: str):
+        """Drop a channel's messages and coverage.
+
+        Used when a run bypasses the index: it still changes reactions, and a
+        later indexed run must not plan from the ``me`` flags stored here.
+        """
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM messages WHERE channel_id = ?", (str(channel_id),))
+            self._db.execute("DELETE FROM coverage WHERE channel_id = ?", (str(channel_id),))
+
+    def forget_message(self, channel_id: str, message_id: str):
+        """Drop a message that no longer exists (e.g. 404 Unknown Message)."""
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM messages WHERE channel_id = ? AND message_id = ?",
+                (channel_id, int(message_id)),
+            )
+
+
+def _nonempty(batch):
+    if batch:
+        yield batch
+
+
+class ChannelPager:
+    """Yield pages of a channel's messages in either order.
+
+    ``fetch_page(params)`` performs one ``GET /channels/{id}/messages`` and
+    returns the message list (``None`` to stop). With an ``index`` the pager
+    serves covered ranges from disk and records every fetched page; without
+    one it simply pages through the API.
+    """
+
+    def __init__(self, channel_id: str, fetch_page, index: MessageIndex = None):
+        self.channel_id = str(channel_id)
+        self.fetch_page = fetch_page
+        self.index = index
+        self.api_pages = 0
+
+    def _fetch(self, params):
+        self.api_pages += 1
+        return self.fetch_page(dict(params, limit=PAGE_SIZE))
+
+    def newest_first(self, before=None, floor=None):
+        """Newest → Oldest, starting below ``before`` (or at the newest message).
+
+        Paging stops at ``floor`` (exclusive lower bound snowflake), if given.
+        """
+        ch, index = self.channel_id, self.index
+        cursor = int(before) if before else None
+        floor = int(floor) if floor is not None else None
+        # A caller's ``before`` may be a date bound past the newest message (or
+        # in the future); only cursors taken from messages/coverage prove that
+        # nothing exists between the page and the cursor
+        cursor_is_bound = cursor is not None
+        if cursor is None and index is not None:
+            top = index.newest_interval(ch)
+            if top is not None:
+                # Incremental sync: only fetch what arrived since the last run
+                after = top[1]
+                while True:
+                    msgs = self._fetch({"after": str(after)})
+                    if msgs is None:
+                        return
+                    if msgs:
+                        newest = max(int(m["id"]) for m in msgs)
+                        index.store_page(ch, msgs, after + 1, newest)
+                        after = newest
+                    if len(msgs) < PAGE_SIZE:
+                        break
+                cursor = after + 1
+        while True:
+            if cursor is not None and (cursor <= 1 or (floor is not None and cursor - 1 <= floor)):
+                return
+            iv = index.interval_containing(ch, cursor - 1) if (index and cursor) else None
+            if iv is not None:
+                batch = index.read_range(ch, iv[0], cursor - 1, descending=True)
+                cursor_is_bound = False
+                if batch:
+                    cursor = int(batch[-1]["id"])
+                    if floor is not None and cursor <= floor:
+                        yield from _nonempty([m for m in batch if int(m["id"]) > floor])
+                        return
+                    yield batch
+                    continue
+                if iv[0] == 0 or (floor is not None and iv[0] <= floor):
+                    return
+                cursor = iv[0]
+                continue
+            params = {"before": str(cursor)} if cursor else {}
+            msgs = self._fetch(params)
+            if not msgs:
+                return
+            msgs.sort(key=lambda m: int(m.get("id", "0")), reverse=True)
+            oldest = int(msgs[-1]["id"])
+            if index is not None:
+                hi = cursor - 1 if cursor and not cursor_is_bound else int(msgs[0]["id"])
+                lo = oldest if len(msgs) == PAGE_SIZE else 0
+                index.store_page(ch, msgs, lo, hi)
+            if floor is not None and oldest <= floor:
+                yield from _nonempty([m for m in msgs if int(m["id"]) > floor])
+                return
+            yield msgs
+            if len(msgs) < PAGE_SIZE:
+                return
+            cursor, cursor_is_bound = oldest, False
+
+    def oldest_first(self, after="0", ceiling=None):
+        """Oldest → Newest, starting above ``after`` (snowflake 0 = channel start).
+
+        Paging stops at ``ceiling`` (exclusive upper bound snowflake), if given.
+        """
+        ch, index = self.channel_id, self.index
+        cursor = int(after or 0)
+        ceiling = int(ceiling) if ceiling is not None else None
+        while True:
+            if ceiling is not None and cursor + 1 >= ceiling:
+                return
+            iv = index.interval_containing(ch, cursor + 1) if index else None
+            if iv is not None:
+                batch = index.read_range(ch, cursor + 1, iv[1], descending=False)
+                if batch:
+                    cursor = int(batch[-1]["id"])
+                    if ceiling is not None and cursor >= ceiling:
+                        yield from _nonempty([m for m in batch if int(m["id"]) < ceiling])
+                        return
+                    yield batch
+                    continue
+                cursor = iv[1]
+                continue
+            msgs = self._fetch({"after": str(cursor)})
+            if not msgs:
+                return
+            msgs.sort(key=lambda m: int(m.get("id", "0")))
+            newest = int(msgs[-1]["id"])
+            if index is not None:
+                index.store_page(ch, msgs, cursor + 1 if cursor else 0, newest)
+            if ceiling is not None and newest >= ceiling:
+                yield from _nonempty([m for m in msgs if int(m["id"]) < ceiling])
+                return
+            yield msgs
+            if len(msgs) < PAGE_SIZE:
+                return
+            cursor = newest
@@ -0,0 +1,114 @@
+"""Producer/consumer helpers for the reaction loop.
+
+Paging through a channel and sending reactions are separate stages: a pager
+thread keeps the next page of messages fetched ahead of time while the
+reaction stage works through the current one, hiding the pagination round
+trip behind reaction pacing. Pages are also checked against the reactions
+they already carry so only requests that change state are sent.
+"""
+
+import queue
+import re
+import threading
+
+_CUSTOM_EMOJI_RE = re.compile(r"^[A-Za-z0-9_~]+:([0-9]+)$")
+
+_ITEM = 0
+_END = 1
+_ERROR = 2
+
+
+class Prefetcher:
+    """Iterate ``iterable`` on a background thread, staying ``depth`` items ahead.
+
+    Exceptions raised by the producer are re-raised in the consumer. The
+    producer stops when ``cancelled()`` returns True or ``close()`` is called.
+    """
+
+    def __init__(self, iterable, depth: int = 1, cancelled=None):
+        self._q = queue.Queue(maxsize=max(1, depth))
+        self._cancelled = cancelled or (lambda: False)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(iter(iterable),), name="page-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def _stopped(self) -> bool:
+        return self._closed.is_set() or self._cancelled()
+
+    def _put(self, item) -> bool:
+        while not self._stopped():
+            try:
+                self._q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, it):
+        try:
+            for item in it:
+                if not self._put((_ITEM, item)):
+                    return
+            self._put((_END, None))
+        except BaseException as e:  # forwarded to the consumer
+            self._put((_ERROR, e))
+
+    def __iter__(self):
+        while True:
+            try:
+                kind, value = self._q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stopped() or not self._thread.is_alive():
+                    if self._q.empty():
+                        return
+                continue
+            if kind == _END:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+
+    def close(self):
+        self._closed.set()
+
+
+def emoji_key(api_emoji: str) -> str:
+    """Comparable identity for an emoji in API form (unicode or ``name:id``).
+
+    Custom emojis compare by ID; unicode emojis by their text without the
+    emoji presentation selector (U+FE0F), which Discord does not always echo.
+    """
+    m = _CUSTOM_EMOJI_RE.match(api_emoji)
+    if m:
+        return f"id:{m.group(1)}"
+    return "u:" + api_emoji.replace("\ufe0f", "")
+
+
+def emoji_object(api_emoji: str) -> dict:
+    """The ``{"id", "name"}`` shape Discord uses for ``api_emoji`` in message payloads."""
+    m = _CUSTOM_EMOJI_RE.match(api_emoji)
+    if m:
+        return {"id": m.group(1), "name": api_emoji.split(":", 1)[0]}
+    return {"id": None, "name": api_emoji}
+
+
+def reaction_emoji_key(emoji: dict):
+    """``emoji_key`` equivalent for an emoji object from a message payload."""
+    if emoji.get("id"):
+        return f"id:{emoji['id']}"
+    if emoji.get("name"):
+        return "u:" + emoji["name"].replace("\ufe0f", "")
+    return None
+
+
+def my_reaction_keys(message: dict) -> set:
+    """Keys of the reactions on ``message`` that the current user has applied."""
+    keys = set()
+    for r in message.get("reactions") or ():
+        if r.get("me"):
+            key = reaction_emoji_key(r.get("emoji") or {})
+            if key:
+                keys.add(key)
+    return keys
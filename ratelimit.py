@@ -0,0 +1,177 @@
+"""Discord rate-limit scheduler driven by response headers.
+
+Instead of sleeping a fixed interval after every request and only backing off
+once a 429 comes back, each request first ``acquire()``s a slot from the
+bucket its route belongs to. Buckets are learned from ``X-RateLimit-Bucket``
+and refilled from ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset-After``, so
+requests go out exactly as fast as Discord allows and 429s become rare.
+"""
+
+import threading
+import time
+import urllib.parse
+
+# Path segments whose following ID is a "major parameter": Discord keeps
+# separate limits per channel/guild/webhook even within one bucket hash.
+MAJOR_PARAMS = ("channels", "guilds", "webhooks")
+
+# Discord's documented global limit (requests/second across all routes).
+GLOBAL_RATE = 50
+
+# Seconds other requests on a bucket nobody has heard back from wait for the
+# first request's headers (longer only if that request never completes).
+PROBE_HOLD = 5.0
+
+
+def route_key(method: str, url: str):
+    """Return ``(route, major_id)`` for a request.
+
+    Snowflakes other than the major parameter and the emoji segment of
+    reaction routes are templated out, so e.g. every reaction PUT in a channel
+    maps to the same route.
+    """
+    path = urllib.parse.urlsplit(url).path
+    parts = path.split("/")
+    out = []
+    major = ""
+    for i, seg in enumerate(parts):
+        prev = parts[i - 1] if i else ""
+        if prev == "reactions" and seg:
+            seg = "{emoji}"
+        elif seg.isdigit():
+            if prev in MAJOR_PARAMS and not major:
+                major = seg
+            else:
+                seg = "{id}"
+        out.append(seg)
+    return f"{method.upper()} {'/'.join(out)}", major
+
+
+class _Bucket:
+    __slots__ = ("limit", "remaining", "reset_at", "known")
+
+    def __init__(self):
+        self.limit = 1
+        self.remaining = 1
+        self.reset_at = 0.0
+        self.known = False  # a response for this bucket has been seen
+
+
+class RateLimiter:
+    """Thread-safe token buckets keyed by Discord route bucket + major parameter."""
+
+    def __init__(self, global_rate: float = GLOBAL_RATE):
+        self._lock = threading.Lock()
+        # Notified whenever a response updates a bucket, so held requests
+        # wake up as soon as the first headers arrive
+        self._changed = threading.Condition(self._lock)
+        self._route_bucket = {}  # route -> X-RateLimit-Bucket hash
+        self._buckets = {}  # (bucket hash or route, major) -> _Bucket
+        self._last_start = {}  # route -> monotonic time of last acquire
+        self._global_until = 0.0
+        self._global_interval = 1.0 / global_rate if global_rate else 0.0
+        self._global_next = 0.0
+
+    def _bucket(self, route: str, major: str) -> _Bucket:
+        key = (self._route_bucket.get(route, route), major)
+        b = self._buckets.get(key)
+        if b is None:
+            b = self._buckets[key] = _Bucket()
+        return b
+
+    def acquire(self, method: str, url: str, min_interval: float = 0.0, cancelled=None) -> bool:
+        """Block until the request may be sent.
+
+        ``min_interval`` optionally caps the rate of this route below what
+        Discord allows (measured start-to-start, so it adds no extra gap).
+        Returns False if ``cancelled()`` became true while waiting.
+        """
+        route, major = route_key(method, url)
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                b = self._bucket(route, major)
+                wait = max(self._global_until, self._global_next) - now
+                if b.remaining <= 0 and b.reset_at > now:
+                    wait = max(wait, b.reset_at - now)
+                if min_interval:
+                    last = self._last_start.get(route)
+                    if last is not None:
+                        wait = max(wait, last + min_interval - now)
+                if wait <= 0:
+                    if b.remaining <= 0:
+                        # Window elapsed: assume a full refill until the next
+                        # response tells us otherwise
+                        b.remaining = b.limit
+                    b.remaining -= 1
+                    if not b.known:
+                        # Nothing is known about this bucket yet: send one
+                        # request and hold the rest until its headers arrive
+                        b.reset_at = now + PROBE_HOLD
+                    self._last_start[route] = now
+                    self._global_next = now + self._global_interval
+                    return True
+                if cancelled is not None and cancelled():
+                    return False
+                self._changed.wait(min(wait, 0.25) if cancelled is not None else wait)
+
+    def update(self, method: str, url: str, resp) -> float:
+        """Record rate-limit headers from ``resp``.
+
+        Returns the number of seconds to wait before retrying if the response
+        was a 429, else 0.
+        """
+        route, major = route_key(method, url)
+        h = resp.headers
+        now = time.monotonic()
+        with self._lock:
+            probe = self._bucket(route, major)
+            if not probe.known:
+                # Release the requests held behind the first one; the headers
+                # below (if any) say how many may follow
+                probe.known = True
+                probe.reset_at = now
+            self._changed.notify_all()
+            bucket_hash = h.get("X-RateLimit-Bucket")
+            if bucket_hash and self._route_bucket.get(route) != bucket_hash:
+                self._route_bucket[route] = bucket_hash
+            b = self._bucket(route, major)
+            b.known = True
+            try:
+                if h.get("X-RateLimit-Limit") is not None:
+                    b.limit = max(1, int(h["X-RateLimit-Limit"]))
+                if h.get("X-RateLimit-Remaining") is not None:
+                    b.remaining = int(h["X-RateLimit-Remaining"])
+                if h.get("X-RateLimit-Reset-After") is not None:
+                    b.reset_at = now + float(h["X-RateLimit-Reset-After"])
+            except (TypeError, ValueError):
+                pass
+            if resp.status_code != 429:
+                return 0.0
+            body = {}
+            try:
+                body = resp.json() or {}
+            except Exception:
+                pass
+            if not isinstance(body, dict):
+                body = {}
+            # The body's retry_after is precise; Retry-After is rounded up to
+            # whole seconds, so it is only the fallback
+            retry = None
+            for value in (body.get("retry_after"), h.get("Retry-After")):
+                try:
+                    retry = float(value)
+                    break
+                except (TypeError, ValueError):
+                    continue
+            if retry is None or retry < 0:
+                retry = 1.0
+            is_global = str(h.get("X-RateLimit-Global", "")).lower() == "true" or bool(
+                body.get("global")
+            )
+            if is_global:
+                self._global_until = max(self._global_until, now + retry)
+            else:
+                b.remaining = 0
+                b.reset_at = max(b.reset_at, now + retry)
+            return retry
@@ -0,0 +1,294 @@
+"""Headless reaction engine.
+
+Pages through a channel and adds (or removes) reactions with no Qt
+dependency: a ``ReactionJob`` goes in, ``Progress`` events come out of
+``ReactionEngine.run()`` as an iterator, and a ``CancelToken`` stops it. The
+GUI, the command-line entry point and benchmarks all drive this same loop.
+"""
+
+import threading
+import urllib.parse
+
+from discord_http import API_BASE, RequestCancelled
+from message_index import ChannelPager
+from pipeline import Prefetcher, emoji_key, my_reaction_keys
+from run_journal import job_key
+
+# Progress event kinds
+PROGRESS = "progress"
+ERROR = "error"
+DONE = "done"
+
+# Discord JSON error code for a message that no longer exists
+UNKNOWN_MESSAGE = 10008
+
+# Reasons carried by the final DONE event
+COMPLETED = "completed"  # reached the end of the channel/range
+LIMIT = "limit"  # max_messages reached
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class CancelToken:
+    """Thread-safe flag used to stop a running job."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class ReactionJob:
+    """Everything that defines one reaction run.
+
+    ``emojis`` are already resolved to API form (unicode or ``name:id``).
+    ``rate`` is an upper bound in reactions/second; the actual pace follows
+    Discord's rate-limit headers. ``range_after``/``range_before`` are
+    exclusive snowflake bounds; ``resume_from`` continues after a journal
+    checkpoint.
+    """
+
+    def __init__(
+        self,
+        channel_id: str,
+        emojis,
+        clear: bool = False,
+        oldest_first: bool = False,
+        max_messages: int = 0,
+        rate: float = 1.0,
+        msg_filter=None,
+        range_after=None,
+        range_before=None,
+        resume_from=None,
+        processed_before: int = 0,
+    ):
+        self.channel_id = str(channel_id)
+        self.emojis = list(emojis)
+        self.clear = bool(clear)
+        self.oldest_first = bool(oldest_first)
+        self.max_messages = int(max_messages or 0)
+        self.rate = float(rate) if rate else 0.0
+        self.msg_filter = msg_filter
+        self.range_after = range_after
+        self.range_before = range_before
+        self.resume_from = resume_from
+        self.processed_before = int(processed_before or 0)
+
+    def key(self) -> str:
+        """Journal key: same channel, emoji set, mode, order and scope."""
+        scope = {}
+        if self.range_after or self.range_before:
+            scope["range"] = [self.range_after, self.range_before]
+        if self.msg_filter is not None:
+            scope["filter"] = self.msg_filter.spec()
+        return job_key(self.channel_id, self.emojis, self.clear, self.oldest_first, scope)
+
+
+class Progress:
+    """One event from ``ReactionEngine.run``."""
+
+    __slots__ = (
+        "kind",
+        "messages",
+        "reactions",
+        "skipped",
+        "filtered",
+        "failed",
+        "last_id",
+        "reason",
+        "error",
+    )
+
+    def __init__(self, kind, counters, last_id=None, reason=None, error=None):
+        self.kind = kind
+        self.messages, self.reactions, self.skipped, self.filtered, self.failed = counters
+        self.last_id = last_id
+        self.reason = reason
+        self.error = error
+
+    def as_dict(self) -> dict:
+        d = {
+            "event": self.kind,
+            "messages": self.messages,
+            "reactions": self.reactions,
+            "skipped": self.skipped,
+            "filtered": self.filtered,
+            "failed": self.failed,
+        }
+        if self.last_id is not None:
+            d["last_id"] = self.last_id
+        if self.reason is not None:
+            d["reason"] = self.reason
+        if self.error is not None:
+            d["error"] = self.error
+        return d
+
+
+def _error_code(resp):
+    """Discord's JSON error ``code`` of a failed response, or None."""
+    try:
+        body = resp.json()
+    except Exception:
+        return None
+    return body.get("code") if isinstance(body, dict) else None
+
+
+class _Abort(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class ReactionEngine:
+    """Runs ``ReactionJob``s against the Discord API.
+
+    ``http`` is a ``DiscordHTTP``; ``journal`` (``RunJournal``) and ``index``
+    (``MessageIndex``) are optional.
+    """
+
+    def __init__(self, http, token: str, journal=None, index=None):
+        self.http = http
+        self.token = token
+        self.journal = journal
+        self.index = index
+
+    def run(self, job: ReactionJob, cancel: CancelToken = None):
+        """Generator of ``Progress`` events; always ends with a DONE event."""
+        cancel = cancel or CancelToken()
+        cancelled = cancel.cancelled
+        headers = {"Authorization": self.token}
+        http, index, journal = self.http, self.index, self.journal
+        key = job.key()
+        interval = 1.0 / job.rate if job.rate > 0 else 0.0
+        messages_url = f"{API_BASE}/channels/{job.channel_id}/messages"
+        # (emoji, url-encoded emoji, identity used to match the page's `reactions`)
+        targets = [(e, urllib.parse.quote(e), emoji_key(e)) for e in job.emojis]
+        counters = [0, 0, 0, 0, 0]  # messages, reactions, skipped, filtered, failed
+
+        def fetch_page(params):
+            """GET one page of messages; None means stop paging."""
+            while not cancelled():
+                r = http.get(messages_url, headers=headers, params=params, cancelled=cancelled)
+                if r.status_code in (401, 403):
+                    raise _Abort(
+                        "Unauthorized" if r.status_code == 401 else "Forbidden fetching messages"
+                    )
+                if r.status_code == 429:
+                    # Transport already waited/retried; the limiter holds the
+                    # next attempt until the bucket resets
+                    continue
+                if not r.ok:
+                    # Not the end of the channel: fail so the checkpoint is
+                    # kept and a resumed run fetches this page again
+                    raise _Abort(f"HTTP {r.status_code} fetching messages")
+                return r.json()
+            return None
+
+        # Newest → Oldest pages with `before`; Oldest → Newest pages forward
+        # from snowflake 0 with `after`. With a local index, already-synced
+        # ranges are read from disk instead of the API.
+        pager = ChannelPager(job.channel_id, fetch_page, index=index)
+        if job.oldest_first:
+            source = pager.oldest_first(
+                job.resume_from or job.range_after or "0", ceiling=job.range_before
+            )
+        else:
+            source = pager.newest_first(
+                job.resume_from or job.range_before, floor=job.range_after
+            )
+        # Pager stage runs one page ahead of the reaction stage
+        pages = Prefetcher(source, depth=1, cancelled=cancelled)
+
+        def checkpoint(mid):
+            if journal is not None:
+                journal.checkpoint(key, mid, job.processed_before + counters[0])
+
+        reason, error, last_id = COMPLETED, None, None
+        unreported = False
+        try:
+            for msgs in pages:
+                for m in msgs:
+                    if cancelled():
+                        break
+                    mid = m.get("id")
+                    if not mid:
+                        continue
+                    # Filter stage: non-matching messages cost no requests
+                    if job.msg_filter is not None and not job.msg_filter.matches(m):
+                        counters[3] += 1
+                        checkpoint(mid)
+                        unreported = True
+                        continue
+                    # Apply all selected emojis sequentially for this message,
+                    # skipping ones whose state would not change
+                    mine = my_reaction_keys(m)
+                    for emoji, enc, ekey in targets:
+                        if (ekey in mine) != job.clear:
+                            counters[2] += 1
+                            continue
+                        resp = http.request(
+                            "DELETE" if job.clear else "PUT",
+                            f"{messages_url}/{mid}/reactions/{enc}/@me",
+                            headers=headers,
+                            min_interval=interval,
+                            cancelled=cancelled,
+                        )
+                        if resp.status_code in (401, 403):
+                            raise _Abort(
+                                "Unauthorized" if resp.status_code == 401 else "Forbidden reacting"
+                            )
+                        if resp.status_code == 404 and _error_code(resp) == UNKNOWN_MESSAGE:
+                            # Deleted since it was fetched (or indexed)
+                            if index is not None:
+                                index.forget_message(job.channel_id, mid)
+                            break
+                        if resp.status_code == 429 or resp.status_code >= 500:
+                            # Still failing after the transport's retries: stop
+                            # before checkpointing this message so a resumed
+                            # run retries it
+                            raise _Abort(f"HTTP {resp.status_code} reacting")
+                        if not resp.ok:
+                            # Rejected for this emoji/message only (e.g. 30010,
+                            # the maximum number of reactions, or 10014 Unknown
+                            # Emoji): count it and go on with the next emoji
+                            counters[4] += 1
+                            continue
+                        if index is not None:
+                            index.set_reaction(job.channel_id, mid, emoji, not job.clear)
+                        counters[1] += 1
+                    counters[0] += 1
+                    last_id = mid
+                    checkpoint(mid)
+                    if job.max_messages and counters[0] >= job.max_messages:
+                        reason = LIMIT
+                        break
+                    unreported = False
+                    yield Progress(PROGRESS, counters, mid)
+                if reason == LIMIT or cancelled():
+                    break
+                if unreported:
+                    # Filtered-out messages are reported once per page
+                    unreported = False
+                    yield Progress(PROGRESS, counters, last_id)
+            if cancelled():
+                reason = CANCELLED
+        except RequestCancelled:
+            reason = CANCELLED
+        except _Abort as e:
+            reason, error = FAILED, e.message
+        except Exception as e:
+            reason, error = FAILED, str(e)
+        finally:
+            pages.close()
+            if journal is not None:
+                journal.flush()
+        if journal is not None and reason == COMPLETED:
+            # Reached the end of the channel: nothing left to resume
+            journal.complete(key)
+        if error is not None:
+            yield Progress(ERROR, counters, last_id, error=error)
+        yield Progress(DONE, counters, last_id, reason=reason)
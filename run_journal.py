@@ -0,0 +1,114 @@
+"""Checkpoint/resume journal for reaction runs.
+
+A run is identified by channel, emoji set, mode (react/clear) and order. While
+it progresses the journal records the last fully processed message snowflake;
+if the run is interrupted (Stop, crash, app closed) the next run of the same
+job can continue from there instead of re-paginating from one end of the
+channel. Finished runs are removed from the journal.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from app_paths import account_scope
+
+# Checkpoints are flushed to disk at most this often (seconds)
+FLUSH_INTERVAL = 2.0
+# Entries untouched for this long are dropped on load
+MAX_AGE = 30 * 24 * 3600
+
+
+def job_key(channel_id: str, emojis, clear: bool, oldest_first: bool, scope=None) -> str:
+    """Stable identifier of a reaction job; emoji order does not matter.
+
+    ``scope`` is any extra JSON-serializable job restriction (e.g. a date range).
+    """
+    spec = [str(channel_id), sorted(emojis), bool(clear), bool(oldest_first)]
+    if scope:
+        spec.append(scope)
+    spec = json.dumps(spec, ensure_ascii=False)
+    return hashlib.sha1(spec.encode("utf-8")).hexdigest()
+
+
+class RunJournal:
+    """Thread-safe JSON journal of in-progress runs, keyed by ``job_key``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        self._last_flush = 0.0
+        self._scope = ""
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        cutoff = time.time() - MAX_AGE
+        self._entries = {
+            k: v
+            for k, v in data.items()
+            if isinstance(v, dict) and v.get("updated_at", 0) >= cutoff
+        }
+
+    def set_scope(self, token: str):
+        """Switch to the runs of the account identified by ``token``; a run's
+        progress (and the reactions it implies) belongs to one user."""
+        with self._lock:
+            self._scope = account_scope(token)
+
+    def _scoped(self, key: str) -> str:
+        # Caller holds the lock
+        return f"{self._scope}:{key}" if self._scope else key
+
+    def get(self, key: str):
+        """Return ``{"last_id", "processed", "updated_at", ...}`` or None."""
+        with self._lock:
+            entry = self._entries.get(self._scoped(key))
+            return dict(entry) if entry else None
+
+    def checkpoint(self, key: str, last_id: str, processed: int, **info):
+        """Record progress; written to disk at most every ``FLUSH_INTERVAL`` seconds."""
+        with self._lock:
+            entry = self._entries.setdefault(self._scoped(key), {})
+            entry.update(info)
+            entry["last_id"] = str(last_id)
+            entry["processed"] = int(processed)
+            entry["updated_at"] = time.time()
+            self._dirty = True
+            due = time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def complete(self, key: str):
+        """Forget a job that ran to the end of the channel."""
+        with self._lock:
+            if self._entries.pop(self._scoped(key), None) is None:
+                return
+            self._dirty = True
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._entries, ensure_ascii=False)
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            tmp = f"{self.path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp, self.path)
+            except OSError:
+                self._dirty = True
@@ -0,0 +1,88 @@
+"""Benchmark the emoji input tokenizer on long mixed inputs.
+
+    python scripts/bench_tokenizer.py [--sizes 1000 10000 100000] [--repeat 5]
+
+Prints the one-off trie build time, then the best-of-N tokenize time per
+input size; time per character should stay flat as inputs grow (linear
+tokenizing). For reference it also times ``emoji.emoji_list`` on the same
+text.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from emoji_tokenizer import EmojiTokenizer  # noqa: E402
+
+# Mix of the token kinds users paste: plain, skin-toned, ZWJ, flags, keycaps,
+# shortcodes, custom name:id and unknown text, with and without separators
+SAMPLES = [
+    "😀",
+    "👍🏽",
+    "👩‍👩‍👧‍👦",
+    "🏳️‍🌈",
+    "🇫🇷",
+    "1️⃣",
+    "❤️",
+    ":fire:",
+    ":thumbsup:",
+    "blob:123456789012345678",
+    "hello",
+]
+SEPARATORS = ["", "", " ", ","]
+
+
+def make_input(size: int, rng: random.Random) -> str:
+    parts, length = [], 0
+    while length < size:
+        part = rng.choice(SAMPLES) + rng.choice(SEPARATORS)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:size]
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args(argv)
+
+    try:
+        import emoji
+    except ImportError:
+        print("the 'emoji' package is required for this benchmark", file=sys.stderr)
+        return 1
+
+    t = time.perf_counter()
+    tokenizer = EmojiTokenizer(emoji.EMOJI_DATA)
+    print(f"build: {(time.perf_counter() - t) * 1000:.1f} ms ({len(emoji.EMOJI_DATA)} sequences)")
+
+    rng = random.Random(0)
+    print(f"{'chars':>9} {'tokens':>8} {'tokenize ms':>12} {'ns/char':>8} {'emoji_list ms':>14}")
+    for size in args.sizes:
+        text = make_input(size, rng)
+        tokens = tokenizer.tokenize(text)
+        ours = best_of(lambda: tokenizer.tokenize(text), args.repeat)
+        ref = best_of(lambda: emoji.emoji_list(text), args.repeat)
+        print(
+            f"{size:>9} {len(tokens):>8} {ours * 1000:>12.2f} "
+            f"{ours / size * 1e9:>8.0f} {ref * 1000:>14.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -65,9 +65,9 @@ try {
         throw "Expected dist directory at '$distDir'."
     }
 
-    $versionMatch = Select-String -Path (Join-Path $projectRoot "DiscordEmotify.py") -Pattern '__version__\s*=\s*"([^"]+)"'
+    $versionMatch = Select-String -Path (Join-Path $projectRoot "app_info.py") -Pattern '__version__\s*=\s*"([^"]+)"'
     if (-not $versionMatch) {
-        throw "Unable to determine application version from DiscordEmotify.py."
+        throw "Unable to determine application version from app_info.py."
     }
     $version = $versionMatch.Matches[0].Groups[1].Value
 
@@ -0,0 +1,65 @@
+"""Search over the friends/channels list.
+
+Names are normalized once when a list is shown (case-folded, accents
+stripped), so a keystroke only compares strings. When the query extends the
+previous one the search narrows the previous result instead of scanning
+everything again. A query with no substring match falls back to a fuzzy,
+in-order subsequence match (``gnrl`` finds ``general``).
+"""
+
+import unicodedata
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def is_subsequence(query: str, text: str) -> bool:
+    pos = 0
+    for ch in query:
+        pos = text.find(ch, pos) + 1
+        if not pos:
+            return False
+    return True
+
+
+class SearchIndex:
+    """Normalized names of a two-level list (rows and their optional parent)."""
+
+    def __init__(self, entries=()):
+        # key -> (normalized text, parent key or None)
+        self._entries = {}
+        for key, text, parent in entries:
+            self._entries[key] = (normalize(text), parent)
+        self.keys = frozenset(self._entries)
+        # (query, matches) of the last substring / fuzzy search, for narrowing
+        self._last = {}
+
+    def _matches(self, query: str, fuzzy: bool):
+        test = is_subsequence if fuzzy else (lambda q, t: q in t)
+        prev = self._last.get(fuzzy)
+        if prev is not None and query.startswith(prev[0]):
+            candidates = prev[1]
+        else:
+            candidates = self._entries
+        entries = self._entries
+        found = {k for k in candidates if test(query, entries[k][0])}
+        self._last[fuzzy] = (query, found)
+        return found
+
+    def visible(self, query: str):
+        """Keys to show for ``query``, or None to show everything.
+
+        A parent stays visible when any of its children matches.
+        """
+        query = normalize(query.strip())
+        if not query:
+            self._last.clear()
+            return None
+        found = self._matches(query, fuzzy=False)
+        if not found:
+            found = self._matches(query, fuzzy=True)
+        parents = {self._entries[k][1] for k in found}
+        parents.discard(None)
+        return found | parents
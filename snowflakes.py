@@ -0,0 +1,30 @@
+"""Discord snowflake ⇄ timestamp helpers.
+
+A snowflake's upper 42 bits are milliseconds since the Discord epoch, so a
+time range maps directly onto ``after``/``before`` message-ID bounds and
+paging can start right at the requested range.
+"""
+
+DISCORD_EPOCH_MS = 1420070400000
+
+
+def snowflake_from_ms(ms: int) -> int:
+    """Smallest snowflake that could have been created at unix time ``ms``."""
+    return max(0, (int(ms) - DISCORD_EPOCH_MS) << 22)
+
+
+def snowflake_to_ms(snowflake) -> int:
+    """Unix time in milliseconds encoded in ``snowflake``."""
+    return (int(snowflake) >> 22) + DISCORD_EPOCH_MS
+
+
+def range_bounds(start_ms: int = None, end_ms: int = None):
+    """Exclusive ``(after, before)`` snowflakes for messages in ``[start_ms, end_ms]``.
+
+    Either side may be None for an open range.
+    """
+    after = snowflake_from_ms(start_ms) - 1 if start_ms is not None else None
+    before = snowflake_from_ms(int(end_ms) + 1) if end_ms is not None else None
+    if after is not None and after < 0:
+        after = None
+    return after, before
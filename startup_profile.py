@@ -0,0 +1,46 @@
+"""Startup timing for ``DiscordEmotify.py --profile-startup``.
+
+``mark(label)`` records the end of a startup phase; marks are always recorded
+(a list append each) but only reported when profiling was enabled. The clock
+starts when this module is imported, which the GUI does first, so the report
+covers module imports, ``QApplication`` and window construction and the first
+paint. Interpreter start-up itself happens before that and is not included.
+"""
+
+import sys
+import time
+
+# Modules that are deliberately not imported before the first paint
+DEFERRED_MODULES = ("requests", "urllib3", "emoji")
+
+_t0 = time.perf_counter()
+_marks = []
+_enabled = False
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def mark(label: str):
+    _marks.append((label, time.perf_counter()))
+
+
+def report() -> str:
+    """Per-phase and cumulative milliseconds since this module was imported."""
+    lines = ["Startup profile (ms)", f"  {'phase':<22}{'self':>9}{'total':>9}"]
+    prev = _t0
+    for label, t in _marks:
+        lines.append(f"  {label:<22}{(t - prev) * 1000:9.1f}{(t - _t0) * 1000:9.1f}")
+        prev = t
+    early = [m for m in DEFERRED_MODULES if m in sys.modules]
+    lines.append(
+        "  deferred modules loaded before first paint: "
+        + (", ".join(early) if early else "none")
+    )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disk_cache import DiskImageCache  # noqa: E402
+
+
+class DiskImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "images")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_directory_is_not_touched_until_first_use(self):
+        cache = DiskImageCache(self.dir)
+        self.assertFalse(os.path.exists(self.dir))
+        self.assertIsNone(cache.get("https://cdn/a.png"))
+        self.assertTrue(os.path.isdir(self.dir))
+
+    def test_entries_survive_a_new_instance(self):
+        DiskImageCache(self.dir).put("https://cdn/a.png", b"aaaa")
+        self.assertEqual(DiskImageCache(self.dir).get("https://cdn/a.png"), b"aaaa")
+
+    def test_scan_evicts_over_budget(self):
+        cache = DiskImageCache(self.dir)
+        for i in range(4):
+            cache.put(f"https://cdn/{i}.png", b"x" * 10)
+            # Distinct mtimes so the scan sees the write order
+            os.utime(os.path.join(self.dir, cache._name(f"https://cdn/{i}.png")), (i, i))
+        small = DiskImageCache(self.dir, max_bytes=25)
+        self.assertIsNone(small.get("https://cdn/0.png"))
+        self.assertIsNone(small.get("https://cdn/1.png"))
+        self.assertEqual(small.get("https://cdn/3.png"), b"x" * 10)
+
+    def test_unusable_directory_is_an_empty_cache(self):
+        blocker = os.path.join(self.tmp.name, "file")
+        open(blocker, "w").close()
+        cache = DiskImageCache(os.path.join(blocker, "images"))
+        cache.put("https://cdn/a.png", b"aaaa")
+        self.assertIsNone(cache.get("https://cdn/a.png"))
+
+
+if __name__ == "__main__":
+    unittest.main()
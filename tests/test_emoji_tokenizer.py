@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from emoji_tokenizer import ZWJ, EmojiTokenizer  # noqa: E402
+
+DATA = {
+    "😀": {"en": ":grinning_face:"},
+    "👍": {"en": ":thumbs_up:", "alias": [":thumbsup:"]},
+    "👩": {"en": ":woman:"},
+    "👧": {"en": ":girl:"},
+    "👩‍👧": {"en": ":family_woman_girl:"},
+}
+
+
+class EmojiTokenizerTest(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = EmojiTokenizer(DATA)
+
+    def test_longest_match_without_separators(self):
+        self.assertEqual(self.tokenizer.tokenize("👩‍👧😀👍"), ["👩‍👧", "😀", "👍"])
+
+    def test_mixed_tokens(self):
+        self.assertEqual(
+            self.tokenizer.tokenize("😀 :fire:,blob:123 hello👍🏽"),
+            ["😀", ":fire:", "blob:123", "hello", "👍🏽"],
+        )
+
+    def test_shortcodes(self):
+        self.assertEqual(self.tokenizer.unicode_for("thumbsup"), "👍")
+        self.assertEqual(self.tokenizer.unicode_for("Thumbs_Up"), "👍")
+        self.assertIsNone(self.tokenizer.unicode_for("nope"))
+
+    def test_long_zwj_chain_is_one_token(self):
+        chain = ZWJ.join(["😀"] * 5000)
+        self.assertEqual(self.tokenizer.tokenize(chain + " 👍"), [chain, "👍"])
+
+    def test_trailing_zwj_is_not_part_of_the_emoji(self):
+        self.assertEqual(self.tokenizer.tokenize("😀" + ZWJ * 3000), ["😀", ZWJ * 3000])
+
+
+if __name__ == "__main__":
+    unittest.main()
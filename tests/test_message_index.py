@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from message_index import PAGE_SIZE, ChannelPager, MessageIndex  # noqa: E402
+
+
+class FakeChannel:
+    """In-memory ``GET /channels/{id}/messages`` with before/after/limit."""
+
+    def __init__(self, ids=()):
+        self.ids = sorted(ids)
+        self.requests = 0
+
+    def post(self, *ids):
+        self.ids = sorted(set(self.ids) | set(ids))
+
+    def fetch_page(self, params):
+        self.requests += 1
+        limit = params.get("limit", PAGE_SIZE)
+        if "after" in params:
+            after = int(params["after"])
+            ids = [i for i in self.ids if i > after][:limit]
+        else:
+            before = int(params["before"]) if "before" in params else None
+            ids = [i for i in self.ids if before is None or i < before][-limit:]
+            ids.reverse()
+        return [{"id": str(i), "content": ""} for i in ids]
+
+
+def ids_of(pages):
+    return [int(m["id"]) for page in pages for m in page]
+
+
+class MessageIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = MessageIndex(os.path.join(self.tmp.name, "messages.sqlite3"))
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def coverage(self, channel_id="1"):
+        with self.index._lock:
+            return [tuple(r) for r in self.index._intervals(channel_id)]
+
+    def test_store_page_merges_adjacent_and_overlapping_intervals(self):
+        self.index.store_page("1", [], 10, 20)
+        self.index.store_page("1", [], 30, 40)
+        self.assertEqual(self.coverage(), [(10, 20), (30, 40)])
+        self.index.store_page("1", [], 21, 29)
+        self.assertEqual(self.coverage(), [(10, 40)])
+        self.index.store_page("1", [], 5, 15)
+        self.assertEqual(self.coverage(), [(5, 40)])
+        self.index.store_page("1", [], 50, 45)  # empty interval: ignored
+        self.assertEqual(self.coverage(), [(5, 40)])
+        self.assertEqual(self.coverage("2"), [])
+
+    def test_second_pass_reads_from_index(self):
+        channel = FakeChannel(range(1000, 1250))
+        first = ids_of(ChannelPager("1", channel.fetch_page, self.index).newest_first())
+        self.assertEqual(first, list(range(1249, 999, -1)))
+        channel.requests = 0
+        pager = ChannelPager("1", channel.fetch_page, self.index)
+        self.assertEqual(ids_of(pager.newest_first()), first)
+        # Only the incremental "anything newer?" request
+        self.assertEqual(channel.requests, 1)
+
+    def test_future_before_bound_does_not_cover_later_messages(self):
+        channel = FakeChannel(range(1000, 1050))
+        pager = ChannelPager("1", channel.fetch_page, self.index)
+        # Date-range end past the newest message (e.g. "until today")
+        self.assertEqual(len(ids_of(pager.newest_first(before=10_000))), 50)
+        self.assertEqual(self.coverage(), [(0, 1049)])
+        channel.post(*range(1050, 1055))
+        pager = ChannelPager("1", channel.fetch_page, self.index)
+        self.assertEqual(ids_of(pager.newest_first())[:5], [1054, 1053, 1052, 1051, 1050])
+        pager = ChannelPager("1", channel.fetch_page, self.index)
+        self.assertEqual(len(ids_of(pager.newest_first(before=10_000))), 55)
+
+    def test_future_before_bound_on_a_full_page(self):
+        channel = FakeChannel(range(1000, 1000 + PAGE_SIZE + 10))
+        pager = ChannelPager("1", channel.fetch_page, self.index)
+        ids = ids_of(pager.newest_first(before=10_000))
+        self.assertEqual(len(ids), PAGE_SIZE + 10)
+        self.assertEqual(self.coverage(), [(0, 1000 + PAGE_SIZE + 9)])
+
+    def test_before_bound_inside_history_still_covers_up_to_it(self):
+        channel = FakeChannel(range(1000, 1300))
+        list(ChannelPager("1", channel.fetch_page, self.index).newest_first(before=1200))
+        self.assertEqual(self.coverage(), [(1000, 1199)])
+        channel.requests = 0
+        pager = ChannelPager("1", channel.fetch_page, self.index)
+        ids = ids_of(pager.newest_first(before=1150))
+        self.assertEqual(ids, list(range(1149, 999, -1)))
+        # Served from disk; only the probe below the oldest indexed message
+        self.assertEqual(channel.requests, 1)
+
+    def test_floor_stops_paging(self):
+        channel = FakeChannel(range(1000, 1300))
+        pager = ChannelPager("1", channel.fetch_page, self.index)
+        self.assertEqual(ids_of(pager.newest_first(floor=1289)), list(range(1299, 1289, -1)))
+
+    def test_oldest_first_then_newest_first(self):
+        channel = FakeChannel(range(1000, 1250))
+        forward = ids_of(ChannelPager("1", channel.fetch_page, self.index).oldest_first())
+        self.assertEqual(forward, list(range(1000, 1250)))
+        channel.requests = 0
+        backward = ids_of(ChannelPager("1", channel.fetch_page, self.index).newest_first())
+        self.assertEqual(backward, forward[::-1])
+        self.assertEqual(channel.requests, 1)
+
+    def test_set_reaction_updates_snapshot(self):
+        channel = FakeChannel([1000])
+        list(ChannelPager("1", channel.fetch_page, self.index).newest_first())
+        self.index.set_reaction("1", "1000", "👍", True)
+        (msg,) = self.index.read_range("1", 0, 2000, descending=True)
+        self.assertEqual(msg["reactions"], [{"emoji": {"id": None, "name": "👍"}, "me": True}])
+        self.index.set_reaction("1", "1000", "👍", False)
+        (msg,) = self.index.read_range("1", 0, 2000, descending=True)
+        self.assertFalse(msg["reactions"][0]["me"])
+
+
+if __name__ == "__main__":
+    unittest.main()
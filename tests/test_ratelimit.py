@@ -0,0 +1,137 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discord_http import API_BASE, DiscordHTTP  # noqa: E402
+from ratelimit import RateLimiter  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("no body")
+        return self._body
+
+
+URL = f"{API_BASE}/channels/1/messages/2/reactions/%F0%9F%91%8D/@me"
+OTHER_URL = f"{API_BASE}/channels/1/messages/3/reactions/%F0%9F%91%8E/@me"
+
+HEADERS = {"X-RateLimit-Bucket": "abc", "X-RateLimit-Limit": "5"}
+
+
+def ok(remaining, reset_after=1.0):
+    return FakeResponse(
+        204,
+        dict(
+            HEADERS,
+            **{"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset-After": str(reset_after)},
+        ),
+    )
+
+
+def timed_acquire(limiter, url=URL, **kwargs):
+    start = time.monotonic()
+    got = limiter.acquire("PUT", url, **kwargs)
+    return got, time.monotonic() - start
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = 0
+
+    def request(self, method, url, **kwargs):
+        self.sent += 1
+        return self.responses.pop(0)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_429_prefers_precise_body_retry_after(self):
+        resp = FakeResponse(429, {"Retry-After": "1"}, {"retry_after": 0.3, "global": False})
+        self.assertAlmostEqual(RateLimiter().update("PUT", URL, resp), 0.3)
+
+    def test_429_falls_back_to_header(self):
+        resp = FakeResponse(429, {"Retry-After": "2"})
+        self.assertEqual(RateLimiter().update("PUT", URL, resp), 2.0)
+        resp = FakeResponse(429, {"Retry-After": "2"}, ["not", "a", "dict"])
+        self.assertEqual(RateLimiter().update("PUT", URL, resp), 2.0)
+
+    def test_429_without_hints_waits_a_second(self):
+        self.assertEqual(RateLimiter().update("PUT", URL, FakeResponse(429, body={})), 1.0)
+
+    def test_success_needs_no_wait(self):
+        resp = FakeResponse(204, {"X-RateLimit-Remaining": "3", "X-RateLimit-Reset-After": "1.5"})
+        self.assertEqual(RateLimiter().update("PUT", URL, resp), 0.0)
+
+    def test_new_bucket_sends_one_request_until_headers_arrive(self):
+        limiter = RateLimiter()
+        self.assertTrue(limiter.acquire("PUT", URL))
+        second = []
+        t = threading.Thread(target=lambda: second.append(timed_acquire(limiter)))
+        t.start()
+        time.sleep(0.2)
+        self.assertEqual(second, [])
+        limiter.update("PUT", URL, ok(remaining=4))
+        t.join(1)
+        self.assertEqual(len(second), 1)
+        # The rest of the window needs no waiting
+        for _ in range(3):
+            self.assertLess(timed_acquire(limiter)[1], 0.05)
+
+    def test_response_without_headers_releases_the_bucket(self):
+        limiter = RateLimiter()
+        limiter.acquire("PUT", URL)
+        limiter.update("PUT", URL, FakeResponse(204))
+        self.assertLess(timed_acquire(limiter)[1], 0.05)
+
+    def test_exhausted_bucket_waits_for_reset(self):
+        limiter = RateLimiter()
+        limiter.acquire("PUT", URL)
+        limiter.update("PUT", URL, ok(remaining=0, reset_after=0.2))
+        got, waited = timed_acquire(limiter)
+        self.assertTrue(got)
+        self.assertGreaterEqual(waited, 0.15)
+
+    def test_routes_share_a_learned_bucket(self):
+        limiter = RateLimiter()
+        limiter.acquire("PUT", URL)
+        limiter.update("PUT", URL, ok(remaining=0, reset_after=0.2))
+        # OTHER_URL templates to the same route, hence the same bucket
+        self.assertGreaterEqual(timed_acquire(limiter, OTHER_URL)[1], 0.15)
+        # Another channel is a different major parameter: not throttled
+        other_channel = URL.replace("/channels/1/", "/channels/9/")
+        self.assertLess(timed_acquire(limiter, other_channel)[1], 0.05)
+
+    def test_min_interval_spaces_request_starts(self):
+        limiter = RateLimiter()
+        limiter.acquire("PUT", URL, min_interval=0.2)
+        limiter.update("PUT", URL, ok(remaining=4))
+        self.assertGreaterEqual(timed_acquire(limiter, min_interval=0.2)[1], 0.15)
+
+    def test_cancelled_wait_returns_false(self):
+        limiter = RateLimiter()
+        limiter.acquire("PUT", URL)
+        limiter.update("PUT", URL, ok(remaining=0, reset_after=30))
+        got, waited = timed_acquire(limiter, cancelled=lambda: True)
+        self.assertFalse(got)
+        self.assertLess(waited, 0.5)
+
+    def test_429_with_zero_retry_after_is_retried(self):
+        http = DiscordHTTP("test")
+        session = FakeSession([FakeResponse(429, body={"retry_after": 0}), ok(remaining=4)])
+        http._local.session = session
+        self.assertEqual(http.put(URL).status_code, 204)
+        self.assertEqual(session.sent, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import os
+import sys
+import tempfile
+import unittest
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from message_filters import TYPE_REPLY, MessageFilter  # noqa: E402
+from message_index import MessageIndex  # noqa: E402
+from reaction_engine import (  # noqa: E402
+    COMPLETED,
+    DONE,
+    FAILED,
+    PROGRESS,
+    ReactionEngine,
+    ReactionJob,
+)
+from run_journal import RunJournal  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self.ok = 200 <= status_code < 300
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeDiscord:
+    """Just enough of ``DiscordHTTP`` for one channel and our own reactions."""
+
+    def __init__(self, ids):
+        self.ids = sorted(ids)
+        self.mine = {}  # message id -> set of emojis we reacted with
+        self.fail = {}  # message id -> (status, error code) returned for PUT/DELETE
+        self.gets = 0
+        self.fail_gets = {}  # GET number (1-based) -> status code
+
+    def get(self, url, headers=None, params=None, cancelled=None):
+        self.gets += 1
+        if self.gets in self.fail_gets:
+            return FakeResponse(self.fail_gets[self.gets], {"message": "fake error"})
+        params = params or {}
+        limit = params.get("limit", 100)
+        if "after" in params:
+            ids = [i for i in self.ids if i > int(params["after"])][:limit]
+        else:
+            before = int(params["before"]) if "before" in params else None
+            ids = [i for i in self.ids if before is None or i < before][-limit:][::-1]
+        return FakeResponse(200, [self.message(i) for i in ids])
+
+    def message(self, mid):
+        return {
+            "id": str(mid),
+            "reactions": [
+                {"emoji": {"id": None, "name": e}, "count": 1, "me": True}
+                for e in sorted(self.mine.get(mid, ()))
+            ],
+        }
+
+    def request(self, method, url, headers=None, min_interval=0, cancelled=None):
+        parts = url.split("/")
+        mid, emoji = int(parts[-4]), urllib.parse.unquote(parts[-2])
+        if ":" in emoji:
+            return FakeResponse(404, {"code": 10014, "message": "Unknown Emoji"})
+        if mid in self.fail:
+            status, code = self.fail[mid]
+            return FakeResponse(status, {"code": code, "message": "fake error"})
+        if method == "PUT":
+            self.mine.setdefault(mid, set()).add(emoji)
+        else:
+            self.mine.get(mid, set()).discard(emoji)
+        return FakeResponse(204)
+
+
+def run(engine, job):
+    events = list(engine.run(job))
+    assert events[-1].kind == DONE
+    return events[-1]
+
+
+class ReactionEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = MessageIndex(os.path.join(self.tmp.name, "messages.sqlite3"))
+        self.journal = RunJournal(os.path.join(self.tmp.name, "journal.json"))
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_react_then_clear(self):
+        discord = FakeDiscord(range(1000, 1150))
+        engine = ReactionEngine(discord, "token", index=self.index)
+        done = run(engine, ReactionJob("1", ["👍"]))
+        self.assertEqual((done.reason, done.messages, done.reactions), (COMPLETED, 150, 150))
+        # Second pass: every reaction is already there, read from the index
+        done = run(engine, ReactionJob("1", ["👍"]))
+        self.assertEqual((done.reactions, done.skipped), (0, 150))
+        done = run(engine, ReactionJob("1", ["👍"], clear=True))
+        self.assertEqual(done.reactions, 150)
+        self.assertFalse(any(discord.mine.values()))
+
+    def test_run_without_index_invalidates_channel(self):
+        discord = FakeDiscord(range(1000, 1050))
+        indexed = ReactionEngine(discord, "token", index=self.index)
+        run(indexed, ReactionJob("1", ["👍"]))
+        # Clear pass that bypasses the index (checkbox off / --no-index)
+        self.index.forget_channel("1")
+        run(ReactionEngine(discord, "token"), ReactionJob("1", ["👍"], clear=True))
+        done = run(indexed, ReactionJob("1", ["👍"]))
+        self.assertEqual(done.reactions, 50)
+        self.assertEqual(len(discord.mine), 50)
+        self.assertTrue(all(discord.mine.values()))
+
+    def test_unknown_message_is_dropped_from_index(self):
+        discord = FakeDiscord(range(1000, 1010))
+        engine = ReactionEngine(discord, "token", index=self.index)
+        discord.fail[1005] = (404, 10008)
+        done = run(engine, ReactionJob("1", ["👍"]))
+        self.assertEqual((done.reason, done.reactions), (COMPLETED, 9))
+        ids = [m["id"] for m in self.index.read_range("1", 0, 2000, descending=False)]
+        self.assertNotIn("1005", ids)
+
+    def test_failed_reaction_is_not_checkpointed(self):
+        discord = FakeDiscord(range(1000, 1010))
+        discord.fail[1005] = (500, 0)
+        engine = ReactionEngine(discord, "token", journal=self.journal)
+        job = ReactionJob("1", ["👍"], oldest_first=True)
+        done = run(engine, job)
+        self.assertEqual((done.reason, done.messages, done.reactions), (FAILED, 5, 5))
+        saved = self.journal.get(job.key())
+        self.assertEqual((saved["last_id"], saved["processed"]), ("1004", 5))
+        # Resuming retries the failed message
+        del discord.fail[1005]
+        job.resume_from, job.processed_before = saved["last_id"], saved["processed"]
+        done = run(engine, job)
+        self.assertEqual((done.reason, done.messages, done.reactions), (COMPLETED, 5, 5))
+        self.assertEqual(sorted(discord.mine), list(range(1000, 1010)))
+        self.assertIsNone(self.journal.get(job.key()))
+
+    def test_failed_page_keeps_the_checkpoint(self):
+        discord = FakeDiscord(range(1000, 1250))
+        discord.fail_gets[2] = 502
+        engine = ReactionEngine(discord, "token", journal=self.journal)
+        job = ReactionJob("1", ["👍"])
+        done = run(engine, job)
+        self.assertEqual((done.reason, done.messages), (FAILED, 100))
+        self.assertEqual(self.journal.get(job.key())["last_id"], "1150")
+
+    def test_rejected_reaction_is_skipped(self):
+        discord = FakeDiscord(range(1000, 1010))
+        discord.fail[1005] = (400, 30010)  # maximum number of reactions reached
+        engine = ReactionEngine(discord, "token", journal=self.journal)
+        job = ReactionJob("1", ["👍"], oldest_first=True)
+        done = run(engine, job)
+        self.assertEqual(
+            (done.reason, done.messages, done.reactions, done.failed), (COMPLETED, 10, 9, 1)
+        )
+        self.assertIsNone(self.journal.get(job.key()))
+
+    def test_unknown_emoji_does_not_drop_messages(self):
+        discord = FakeDiscord(range(1000, 1010))
+        engine = ReactionEngine(discord, "token", index=self.index)
+        done = run(engine, ReactionJob("1", ["bad:1", "👍"]))
+        self.assertEqual((done.reason, done.reactions, done.failed), (COMPLETED, 10, 10))
+        self.assertEqual(len(self.index.read_range("1", 0, 2000, descending=False)), 10)
+
+    def test_journal_is_scoped_per_account(self):
+        discord = FakeDiscord(range(1000, 1250))
+        discord.fail_gets[2] = 502
+        job = ReactionJob("1", ["👍"])
+        self.journal.set_scope("token-a")
+        run(ReactionEngine(discord, "token-a", journal=self.journal), job)
+        self.assertIsNotNone(self.journal.get(job.key()))
+        self.journal.set_scope("token-b")
+        self.assertIsNone(self.journal.get(job.key()))
+        self.journal.set_scope("token-a")
+        self.assertEqual(self.journal.get(job.key())["last_id"], "1150")
+
+    def test_forbidden_stops_the_run(self):
+        discord = FakeDiscord(range(1000, 1010))
+        discord.fail[1005] = (403, 50013)
+        done = run(ReactionEngine(discord, "token"), ReactionJob("1", ["👍"], oldest_first=True))
+        self.assertEqual((done.reason, done.reactions), (FAILED, 5))
+
+    def test_progress_without_reactions(self):
+        discord = FakeDiscord(range(1000, 1250))
+        # Every message skipped: one event per message
+        discord.mine = {i: {"👍"} for i in discord.ids}
+        events = list(ReactionEngine(discord, "token").run(ReactionJob("1", ["👍"])))
+        progress = [ev for ev in events if ev.kind == PROGRESS]
+        self.assertEqual(len(progress), 250)
+        self.assertEqual(progress[-1].skipped, 250)
+        # Every message filtered out: one event per page
+        job = ReactionJob("1", ["👍"], msg_filter=MessageFilter(types=[TYPE_REPLY]))
+        events = list(ReactionEngine(discord, "token").run(job))
+        progress = [ev for ev in events if ev.kind == PROGRESS]
+        self.assertEqual([ev.filtered for ev in progress], [100, 200, 250])
+
+
+if __name__ == "__main__":
+    unittest.main()